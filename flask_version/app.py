@@ -3,173 +3,454 @@ Sudoku Tips Giver
 Copyright (c) 2025 Sudoku Tips Giver
 
 A web application that helps users solve Sudoku puzzles with intelligent hints.
+
+Start-up has two phases. warm_up() runs once per process that imports the app: it compiles the
+page template, generates a few puzzles per difficulty and caches their first hint. With a
+preloading gunicorn master (see gunicorn.conf.py) this happens before the fork, so every worker
+shares the result copy-on-write. start_background() then starts the solver processes, the
+puzzle pool threads and the session flush thread, which must happen in each worker after the
+fork. create_app() runs both; importing this module without SUDOKU_PRELOAD=1 calls it directly.
 """
 
-from flask import Flask, render_template, jsonify, request
-from functions import Board, is_valid
-from sudoku_solver import get_next_hint, solve_sudoku, has_unique_solution
-import random
-import copy
+import time
+_import_start = time.perf_counter()
+
+from flask import Flask, render_template, jsonify, request, g, Response, redirect, url_for
+from sudoku_solver import hint_analysis, hint_result, get_next_hints, analyze_hint, analyze_hints, hint_cache, solution_cache, board_key, TIMED_OUT
+from sudoku_generator import generate_sudoku, DIFFICULTY_RANGES
+from puzzle_pool import PuzzlePool
+from executor import SolverExecutor, DeadlineExceeded
+from session_store import SessionStore, new_session_id
+from session_db import SQLiteSessionBackend
+from metrics import metrics, collect, reset_metrics
+from search_budget import SearchBudget
+from puzzle_ids import generate_from_id, parse_puzzle_id, puzzle_etag, daily_puzzle_id, content_puzzle_id, DIFFICULTY_CODES
+from solve_path import SolvePathStore, with_solve_path
+from result_cache import LRUCache
+from wire import decode_board, read_boards, request_format, response_format, encode_boards
+import atexit
+import datetime
+import os
+import re
+import threading
 from flask_cors import CORS
+from jinja2 import TemplateNotFound
 
 app = Flask(__name__)
 CORS(app)
 
-board = Board()
+# 每个玩家的棋盘和草稿按会话保存，超出上限时淘汰最久未使用的会话
+SESSION_COOKIE = 'sudoku_sid'
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{22}$')
+SESSION_TTL = float(os.environ.get('SESSION_TTL', 86400)) or None
+# 会话写入 SQLite 文件（同一主机的所有 worker 共享），SESSION_DB 为空时只保存在内存中
+SESSION_DB = os.environ.get('SESSION_DB', 'sessions.db')
+session_backend = SQLiteSessionBackend(
+    SESSION_DB,
+    flush_interval=float(os.environ.get('SESSION_FLUSH_INTERVAL', 1.0)),
+    flush_size=int(os.environ.get('SESSION_FLUSH_SIZE', 256)),
+    ttl=SESSION_TTL,
+) if SESSION_DB else None
+session_store = SessionStore(
+    max_sessions=int(os.environ.get('SESSION_MAX', 10000)),
+    # 内存中会话棋盘占用的字节数上限，为 0 时只限制会话数量
+    max_bytes=int(os.environ.get('SESSION_MAX_BYTES', 0)) or None,
+    ttl=SESSION_TTL,
+    backend=session_backend,
+)
+
+# 生成和求解在进程池中执行，超过时限（秒）返回超时错误；SOLVER_WORKERS=0 时在请求线程内执行
+GENERATE_TIMEOUT = float(os.environ.get('GENERATE_TIMEOUT', 10))
+HINT_TIMEOUT = float(os.environ.get('HINT_TIMEOUT', 5))
+BATCH_HINT_TIMEOUT = float(os.environ.get('BATCH_HINT_TIMEOUT', 30))
+# 批量提示接口单次请求最多包含的棋盘数量，以及每个工作进程任务处理的棋盘数量
+MAX_BATCH_BOARDS = int(os.environ.get('MAX_BATCH_BOARDS', 100))
+BATCH_CHUNK_SIZE = max(1, int(os.environ.get('BATCH_CHUNK_SIZE', 4)))
+# 用户提交的棋盘做唯一性检查时的搜索预算（节点数 / 秒，0 表示不限），用完时返回无法判断
+HINT_BUDGET = SearchBudget(int(os.environ.get('HINT_MAX_NODES', 20000)) or None,
+                           float(os.environ.get('HINT_MAX_SECONDS', 2)) or None)
+BATCH_HINT_BUDGET = SearchBudget(int(os.environ.get('BATCH_HINT_MAX_NODES', 5000)) or None,
+                                 float(os.environ.get('BATCH_HINT_MAX_SECONDS', 0.5)) or None)
+# 工作进程 fork 时复制了 Web 进程的指标，开始工作前先清空，否则这些值会被再合并一次
+solver_executor = SolverExecutor(int(os.environ['SOLVER_WORKERS']) if 'SOLVER_WORKERS' in os.environ else None,
+                                 initializer=reset_metrics)
+
+def run_in_pool(fn, *args, timeout):
+    if solver_executor.workers <= 0:
+        # 在请求线程内执行时指标直接记录在本进程，不能先取出再合并
+        return fn(*args)
+    # 工作进程中记录的指标随结果一起返回，合并到 Web 进程的 metrics
+    result, delta = solver_executor.run(collect, fn, *args, timeout=timeout)
+    metrics.merge(delta)
+    return result
+
+def generate_in_pool(difficulty):
+    # 解题路径在生成谜题的工作进程中一并记录
+    return run_in_pool(with_solve_path, generate_sudoku, difficulty, timeout=GENERATE_TIMEOUT)
+
+def analyze_in_pool(board):
+    return run_in_pool(analyze_hint, board, HINT_BUDGET.renew(), timeout=HINT_TIMEOUT)
+
+def analyze_many_in_pool(boards):
+    if solver_executor.workers <= 0:
+        return analyze_hints(boards, BATCH_HINT_BUDGET)
+    # 整批棋盘分块后分散到所有工作进程；某一块超时只让这一块的棋盘返回超时，不影响其他结果
+    chunks = [boards[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(boards), BATCH_CHUNK_SIZE)]
+    results = solver_executor.run_all(collect, [(analyze_hints, chunk, BATCH_HINT_BUDGET) for chunk in chunks],
+                                      timeout=BATCH_HINT_TIMEOUT)
+    analyses = []
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, DeadlineExceeded):
+            analyses += [TIMED_OUT] * len(chunk)
+        else:
+            chunk_analyses, delta = result
+            metrics.merge(delta)
+            analyses += chunk_analyses
+    return analyses
+
+# 按编号生成的谜题：进程内缓存，并允许浏览器和代理长期缓存（同一编号的内容永远不变）
+puzzle_cache = LRUCache(int(os.environ.get('PUZZLE_CACHE_SIZE', 1024)))
+PUZZLE_MAX_AGE = int(os.environ.get('PUZZLE_MAX_AGE', 31536000))
+# 生成的谜题按编号保存解题路径，这些谜题的提示直接查表，不再搜索
+solve_paths = SolvePathStore(
+    int(os.environ.get('SOLVE_PATH_CACHE_SIZE', 2048)),
+    float(os.environ.get('SOLVE_PATH_CACHE_TTL', 86400)) or None,
+)
+# 每日挑战的重定向只缓存较短时间，日期变化后尽快指向新的谜题
+DAILY_MAX_AGE = int(os.environ.get('DAILY_MAX_AGE', 300))
+
+def boards_response(fields, *boards):
+    """
+    Return fields as JSON, or only the boards in the compact form the client accepts (see wire.py).
+    The compact forms carry the puzzle ID, if any, in the X-Puzzle-Id header.
+    """
+    fmt = response_format(request)
+    if fmt == 'json':
+        response = jsonify(fields)
+    else:
+        body, mimetype = encode_boards(boards, fmt)
+        response = Response(body, mimetype=mimetype)
+        if 'id' in fields:
+            response.headers['X-Puzzle-Id'] = fields['id']
+    response.vary.add('Accept')
+    return response
+
+def request_boards(batch=False):
+    """
+    Read the boards of a request: data['board'] (or data['boards'] if batch) of a JSON body, or a compact body.
+    Returns:
+        list: The boards. For JSON batches they are left undecoded, get_next_hints reports invalid ones one by one.
+    Raises:
+        ValueError: If the body does not hold the expected boards.
+    """
+    if request_format(request) != 'json':
+        boards = read_boards(request)
+        if not batch and len(boards) != 1:
+            raise ValueError("Expected exactly one board.")
+        return boards
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise ValueError("Invalid JSON body.")
+    if batch:
+        if not isinstance(data.get('boards'), list):
+            raise ValueError("No boards in the request.")
+        return data['boards']
+    if 'board' not in data:
+        raise ValueError("No board in the request.")
+    return [decode_board(data['board'])]
+
+def timeout_response():
+    return jsonify({
+        'success': False,
+        'error': 'timeout',
+        'message': '计算超时，请稍后重试'
+    }), 503
+
+# 后台预生成的数独池，PUZZLE_POOL_HIGH=0 时关闭
+puzzle_pool = PuzzlePool(
+    generate_in_pool,
+    DIFFICULTY_RANGES,
+    low_watermark=int(os.environ.get('PUZZLE_POOL_LOW', 2)),
+    high_watermark=int(os.environ.get('PUZZLE_POOL_HIGH', 10)),
+    workers=int(os.environ.get('PUZZLE_POOL_WORKERS', 1)),
+)
+
+# 预热时每个难度为每个 worker 预先生成的数独数量
+WARMUP_PUZZLES = int(os.environ.get('WARMUP_PUZZLES', 2))
+# 启动各阶段耗时（秒）
+startup_times = {}
+_seed_puzzles = {}
+_warmed = False
+_started = False
+_start_lock = threading.Lock()
+
+def record_startup(phase, seconds):
+    startup_times[phase] = seconds
+    metrics.set('sudoku_startup_seconds', seconds, phase=phase)
+    app.logger.info("startup phase %s took %.3fs", phase, seconds)
+
+def warm_up(puzzles=WARMUP_PUZZLES, shares=1):
+    """
+    Prepare state that can be shared by forked workers. Runs only once per process.
+    Args:
+        puzzles (int): Puzzles to pre-generate per difficulty and worker.
+        shares (int): Number of workers the pre-generated puzzles are split between.
+    """
+    global _warmed
+    if _warmed:
+        return
+    _warmed = True
+    start = time.perf_counter()
+    try:
+        app.jinja_env.get_template('index.html')
+    except TemplateNotFound:
+        app.logger.warning("template index.html not found, skipping template warm-up")
+    for difficulty in DIFFICULTY_RANGES:
+        seeded = [with_solve_path(generate_sudoku, difficulty) for _ in range(puzzles * shares)]
+        # 预先计算这些谜题的第一步提示
+        for board, _, _ in seeded:
+            hint_cache.put(board_key(board), analyze_hint(board))
+        _seed_puzzles[difficulty] = seeded
+    record_startup('warm_up', time.perf_counter() - start)
+
+def start_background(share=0, shares=1):
+    """
+    Start the solver processes and background threads of this worker. Runs only once per process.
+    Args:
+        share (int, optional): Index of this worker's share of the pre-generated puzzles; None takes none.
+        shares (int): Number of shares the puzzles were generated for.
+    """
+    global _started
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+        start = time.perf_counter()
+        # 在启动后台线程之前创建工作进程
+        solver_executor.start()
+        if share is not None:
+            for difficulty, seeded in _seed_puzzles.items():
+                puzzle_pool.seed(difficulty, seeded[share::shares])
+        _seed_puzzles.clear()
+        puzzle_pool.start()
+        if session_backend is not None:
+            session_backend.start()
+            atexit.register(session_backend.stop)
+        record_startup('start_background', time.perf_counter() - start)
+
+def create_app(start=True, shares=1):
+    """
+    Warm up and, unless start is False, start the background work.
+    Args:
+        start (bool): False when a preloading server forks workers after this call.
+        shares (int): Number of workers that will split the pre-generated puzzles.
+    Returns:
+        Flask: The application.
+    """
+    warm_up(shares=shares)
+    if start:
+        start_background()
+    return app
+
+def session_id():
+    # 没有或无效的 Cookie 时分配新的会话 ID，在响应中写回
+    sid = request.cookies.get(SESSION_COOKIE, '')
+    if not SESSION_ID_PATTERN.match(sid):
+        sid = g.get('new_session_id') or new_session_id()
+        g.new_session_id = sid
+    return sid
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    # 按路由模板（而不是具体 URL）统计，避免标签数量无限增长
+    if 'request_start' in g:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics.observe('sudoku_http_request_duration_seconds', time.perf_counter() - g.request_start,
+                        route=route, method=request.method)
+        metrics.inc('sudoku_http_requests_total', route=route, method=request.method, status=response.status_code)
+    return response
+
+@app.after_request
+def set_session_cookie(response):
+    if 'new_session_id' in g:
+        response.set_cookie(SESSION_COOKIE, g.new_session_id, max_age=int(session_store.ttl or 86400),
+                            httponly=True, samesite='Lax')
+    return response
 
 @app.route('/')
 def index():
     return render_template('index.html', title='数独提示器 | Sudoku Tips Giver')
 
-def generate_sudoku(difficulty='medium'):
-    # 根据难度设置保留的数字数量范围
-    difficulty_ranges = {
-        'easy': (35, 40),
-        'medium': (25, 30),
-        'hard': (20, 25)
-    }
-    min_numbers, max_numbers = difficulty_ranges.get(difficulty, (25, 30))  # 默认中等难度
-    
-    board = [[0]*9 for _ in range(9)]
-    solution = None
-    
-    # 首先生成一个完整的有效数独
-    def fill_board(board):
-        empty = find_empty(board)
-        if not empty:
-            return True
-            
-        row, col = empty
-        nums = list(range(1, 10))
-        random.shuffle(nums)  # 随机打乱数字顺序
-        
-        for num in nums:
-            if is_valid(board, row, col, num):
-                board[row][col] = num
-                if fill_board(board):
-                    return True
-                board[row][col] = 0
-        return False
-    
-    def find_empty(board):
-        for i in range(len(board)):
-            for j in range(len(board[0])):
-                if board[i][j] == 0:
-                    return (i, j)
-        return None
-    
-    def is_valid(board, row, col, num):
-        # 检查行
-        for x in range(9):
-            if board[row][x] == num:
-                return False
-        
-        # 检查列
-        for x in range(9):
-            if board[x][col] == num:
-                return False
-        
-        # 检查3x3方格
-        start_row = row - row % 3
-        start_col = col - col % 3
-        for i in range(3):
-            for j in range(3):
-                if board[i + start_row][j + start_col] == num:
-                    return False
-        return True
-    
-    # 生成完整的数独解
-    fill_board(board)
-    solution = copy.deepcopy(board)
-    
-    # 获取所有填充的位置
-    filled_positions = [(i, j) for i in range(9) for j in range(9)]
-    random.shuffle(filled_positions)
-    
-    # 计算需要移除的数字数量
-    total_numbers = 81
-    target_numbers = random.randint(min_numbers, max_numbers)
-    numbers_to_remove = total_numbers - target_numbers
-    
-    # 逐个移除数字，确保保持唯一解
-    removed = 0
-    for pos in filled_positions:
-        if removed >= numbers_to_remove:
-            break
-            
-        row, col = pos
-        temp = board[row][col]
-        board[row][col] = 0
-        
-        # 如果移除后不再具有唯一解，恢复该数字
-        board_copy = copy.deepcopy(board)
-        if not has_unique_solution(board_copy):
-            board[row][col] = temp
-        else:
-            removed += 1
-    
-    return board, solution
-
 @app.route('/generate', methods=['POST'])
 def generate():
     try:
-        data = request.get_json()
-        difficulty = data.get('difficulty', 'medium')  # 如果未指定难度，默认为中等
-        board, solution = generate_sudoku(difficulty)
-        return jsonify({
+        data = request.get_json(silent=True) or {}
+        # 如果未指定难度，默认为中等；紧凑格式的客户端也可以通过查询参数指定
+        difficulty = data.get('difficulty') or request.args.get('difficulty', 'medium')
+        # 优先从预生成池中取，池为空时才现场生成
+        puzzle = puzzle_pool.get(difficulty)
+        if puzzle is None:
+            puzzle = generate_in_pool(difficulty)
+        board, solution, path = puzzle
+        puzzle_id = content_puzzle_id(board)
+        solve_paths.put(puzzle_id, board, solution, path)
+        # 新谜题开始时重置该会话的棋盘和草稿
+        session_store.reset(session_id(), board)
+        return boards_response({
             'success': True,
+            'id': puzzle_id,  # 请求提示时带上编号即可使用预先记录的解题路径
             'board': board,
             'solution': solution
-        })
+        }, board, solution)
+    except DeadlineExceeded:
+        return timeout_response()
     except Exception as e:
         return jsonify({
             'success': False,
             'message': '生成数独时发生错误'
         })
 
+@app.route('/puzzle/<puzzle_id>', methods=['GET'])
+def puzzle_by_id(puzzle_id):
+    try:
+        difficulty, _ = parse_puzzle_id(puzzle_id)
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'message': '无效的谜题编号'
+        }), 404
+
+    # ETag 只取决于编号和返回格式，客户端已有缓存时不需要生成谜题
+    fmt = response_format(request)
+    etag = puzzle_etag(puzzle_id) if fmt == 'json' else f'{puzzle_etag(puzzle_id)}.{fmt}'
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.vary.add('Accept')
+    else:
+        try:
+            puzzle = puzzle_cache.get(puzzle_id)
+            if puzzle is None:
+                puzzle = run_in_pool(with_solve_path, generate_from_id, puzzle_id, timeout=GENERATE_TIMEOUT)
+                puzzle_cache.put(puzzle_id, puzzle)
+                solve_paths.put(puzzle_id, *puzzle)
+            elif puzzle_id not in solve_paths:
+                # 解题路径的缓存更小且会过期，谜题仍在缓存中时把路径放回去
+                solve_paths.put(puzzle_id, *puzzle)
+        except DeadlineExceeded:
+            return timeout_response()
+        board, solution, _ = puzzle
+        response = boards_response({
+            'success': True,
+            'id': puzzle_id,
+            'difficulty': difficulty,
+            'board': board,
+            'solution': solution
+        }, board, solution)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={PUZZLE_MAX_AGE}, immutable'
+    return response
+
+@app.route('/daily/<difficulty>', methods=['GET'])
+def daily(difficulty):
+    if difficulty not in DIFFICULTY_CODES:
+        return jsonify({
+            'success': False,
+            'message': '无效的难度'
+        }), 404
+    puzzle_id = daily_puzzle_id(datetime.date.today(), difficulty)
+    response = redirect(url_for('puzzle_by_id', puzzle_id=puzzle_id))
+    response.headers['Cache-Control'] = f'public, max-age={DAILY_MAX_AGE}'
+    return response
+
+@app.route('/pool_stats', methods=['GET'])
+def pool_stats():
+    return jsonify({
+        'success': True,
+        'low_watermark': puzzle_pool.low_watermark,
+        'high_watermark': puzzle_pool.high_watermark,
+        'pools': puzzle_pool.stats()
+    })
+
+@app.route('/cache_stats', methods=['GET'])
+def cache_stats():
+    # 计数器只统计 Web 进程；求解进程池中的缓存各自独立
+    return jsonify({
+        'success': True,
+        'hint_cache': hint_cache.stats(),
+        'solution_cache': solution_cache.stats(),
+        'puzzle_cache': puzzle_cache.stats(),
+        'solve_paths': solve_paths.stats()
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics_page():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/session_stats', methods=['GET'])
+def session_stats():
+    return jsonify({
+        'success': True,
+        'sessions': session_store.stats()
+    })
+
 @app.route('/get_hint', methods=['POST'])
 def hint():
     try:
-        data = request.json
-        if not data or 'board' not in data:
+        try:
+            boards = request_boards()
+        except ValueError:
             return jsonify({
                 'success': False,
                 'message': '无效的请求数据'
             })
 
-        board_str = ''.join([''.join(map(str, row)) for row in data['board']])
-        board = Board()
-        board.string_to_board(board_str)
+        # 棋盘已直接解码为二维列表，不再经过字符串转换
+        board = boards[0]
+
+        # 生成的谜题优先使用预先记录的解题路径，匹配不上时再搜索
+        puzzle_id = request.args.get('puzzle_id')
+        if puzzle_id is None and request_format(request) == 'json':
+            puzzle_id = request.get_json(silent=True).get('puzzle_id')
+        analysis = solve_paths.match(puzzle_id, board) if isinstance(puzzle_id, str) else None
         
-        # 获取下一步提示
-        result = get_next_hint(board.board)
-        if result[0] is None:
+        # 获取下一步提示；响应格式与 /get_hints 的每一项相同（超出搜索预算时 undetermined 为 True）
+        analysis = hint_analysis(board, analyze=analyze_in_pool, analysis=analysis)
+        return jsonify(hint_result(analysis, board))
+    except DeadlineExceeded:
+        return timeout_response()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'处理请求时发生错误: {str(e)}'
+        })
+
+@app.route('/get_hints', methods=['POST'])
+def hints():
+    try:
+        try:
+            boards = request_boards(batch=True)
+        except ValueError:
             return jsonify({
                 'success': False,
-                'message': result[1]
+                'message': '无效的请求数据'
             })
-        
-        row, col, num, message = result
-        
-        # 获取这个位置所有可能的数字
-        possible_numbers = []
-        for n in range(1, 10):
-            if is_valid(board.board, row, col, n):
-                possible_numbers.append(n)
-        
-        # 找到最少可能性的格子
-        min_row, min_col, min_constraint = board.find_constraint()
-        is_minimal = (row == min_row and col == min_col)
-        
+        if len(boards) > MAX_BATCH_BOARDS:
+            return jsonify({
+                'success': False,
+                'message': f'一次最多提交 {MAX_BATCH_BOARDS} 个数独'
+            }), 400
+
+        results = get_next_hints(boards, analyze_many=analyze_many_in_pool)
         return jsonify({
             'success': True,
-            'row': row,
-            'col': col,
-            'number': num,  # 如果只有一个可能的数字，这里会有值
-            'possible_numbers': possible_numbers,
-            'is_minimal': is_minimal,  # 标记是否是最少可能性的格子
-            'message': message
+            'results': results
         })
+    except DeadlineExceeded:
+        return timeout_response()
     except Exception as e:
         return jsonify({
             'success': False,
@@ -187,8 +468,9 @@ def add_draft():
         return jsonify({'success': False, 'error': 'Missing data'}), 400
     
     try:
-        board.add_draft_number(row, col, number)
-        draft_numbers = board.get_draft_numbers(row, col)
+        with session_store.edit(session_id()) as board:
+            board.add_draft_number(row, col, number)
+            draft_numbers = board.get_draft_numbers(row, col)
         return jsonify({
             'success': True,
             'draft_numbers': sorted(list(draft_numbers))
@@ -207,8 +489,9 @@ def remove_draft():
         return jsonify({'success': False, 'error': 'Missing data'}), 400
     
     try:
-        board.remove_draft_number(row, col, number)
-        draft_numbers = board.get_draft_numbers(row, col)
+        with session_store.edit(session_id()) as board:
+            board.remove_draft_number(row, col, number)
+            draft_numbers = board.get_draft_numbers(row, col)
         return jsonify({
             'success': True,
             'draft_numbers': sorted(list(draft_numbers))
@@ -226,7 +509,8 @@ def clear_draft():
         return jsonify({'success': False, 'error': 'Missing data'}), 400
     
     try:
-        board.clear_draft_numbers(row, col)
+        with session_store.edit(session_id()) as board:
+            board.clear_draft_numbers(row, col)
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -234,10 +518,17 @@ def clear_draft():
 @app.route('/clear_all_drafts', methods=['POST'])
 def clear_all_drafts():
     try:
-        board.clear_all_draft_numbers()
+        with session_store.edit(session_id()) as board:
+            board.clear_all_draft_numbers()
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+record_startup('import', time.perf_counter() - _import_start)
+
+# 由预加载的 gunicorn 主进程导入时，后台任务在每个 worker 的 post_fork 中启动
+if os.environ.get('SUDOKU_PRELOAD') != '1':
+    create_app()
+
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
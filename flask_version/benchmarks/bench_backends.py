@@ -0,0 +1,78 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Benchmark comparing the solver backends on a corpus of hard puzzles.
+
+Usage:
+    python benchmarks/bench_backends.py [corpus] [--timeout SECONDS] [--backends backtrack,dlx]
+
+Every puzzle is checked with count_solutions(limit=2), the call used for uniqueness checks.
+Searches slower than --timeout are aborted (Unix only) and reported as timeouts.
+"""
+
+import argparse
+import os
+import signal
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions import string_to_board
+from sudoku_solver import BACKENDS, count_solutions
+
+
+class _Timeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _Timeout()
+
+
+def run_backend(backend, puzzles, timeout):
+    """返回 (耗时列表, 超时数量)"""
+    times = []
+    timeouts = 0
+    for puzzle in puzzles:
+        board = string_to_board(puzzle)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        start = time.perf_counter()
+        try:
+            count = count_solutions(board, limit=2, backend=backend, use_cache=False)
+        except _Timeout:
+            timeouts += 1
+            continue
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        times.append(time.perf_counter() - start)
+        if count != 1:
+            print(f"warning: {backend} found {count} solutions for {puzzle}", file=sys.stderr)
+    return times, timeouts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Sudoku solver backends")
+    parser.add_argument('corpus', nargs='?',
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hard17.txt'))
+    parser.add_argument('--timeout', type=float, default=10.0, help="per-puzzle time limit in seconds")
+    parser.add_argument('--backends', default=','.join(BACKENDS))
+    args = parser.parse_args()
+
+    with open(args.corpus) as f:
+        puzzles = [line.strip() for line in f if line.strip()]
+
+    signal.signal(signal.SIGALRM, _on_alarm)
+    print(f"{len(puzzles)} puzzles from {args.corpus}")
+    print(f"{'backend':<10} {'solved':>7} {'timeout':>8} {'total s':>9} {'mean ms':>9} {'max ms':>9}")
+    for backend in args.backends.split(','):
+        times, timeouts = run_backend(backend, puzzles, args.timeout)
+        total = sum(times)
+        mean = total / len(times) * 1000 if times else float('nan')
+        worst = max(times) * 1000 if times else float('nan')
+        print(f"{backend:<10} {len(times):>7} {timeouts:>8} {total:>9.3f} {mean:>9.2f} {worst:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
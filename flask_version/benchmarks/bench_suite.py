@@ -0,0 +1,242 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Reproducible benchmark suite for the solver, uniqueness check, generator and hints.
+
+Usage:
+    python benchmarks/bench_suite.py [-o results.json] [--baseline baseline.json] [--threshold 0.2]
+
+The bundled corpora are easy.txt and medium.txt (produced by generate_sudoku with seed 2025),
+hard.txt (well-known hard puzzles plus generated hard ones) and hard17.txt (17-clue puzzles).
+Every benchmark seeds the random module with --seed before it starts, so node counts are
+identical between runs; result caches are bypassed so every call does the full work.
+For each benchmark the latency percentiles (ms) and search-node counts are printed and written
+as JSON. With --baseline, results whose median latency or mean node count grew by more than
+--threshold (and, for latency, by more than --min-ms) are reported as regressions and the
+exit code is 1.
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from functions import is_valid, find_constraint, string_to_board
+from sudoku_solver import find_solutions, has_unique_solution, analyze_hint, solution_cache, DEFAULT_BACKEND
+from sudoku_generator import generate_sudoku, DIFFICULTY_RANGES
+
+CORPORA = ('easy', 'medium', 'hard', 'hard17')
+
+
+def load_corpus(name):
+    """读取 benchmarks/<name>.txt，每行一个谜题"""
+    with open(os.path.join(BENCH_DIR, name + '.txt')) as f:
+        return [string_to_board(line.strip()) for line in f if line.strip()]
+
+
+def percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def summarize(times, nodes):
+    """
+    Summarize latency samples (seconds) and node counts.
+    Returns:
+        dict: calls, mean_ms, p50_ms, p90_ms, p99_ms, max_ms and, if nodes were counted,
+              nodes_mean and nodes_max.
+    """
+    ordered = sorted(times)
+    result = {
+        'calls': len(ordered),
+        'mean_ms': sum(ordered) / len(ordered) * 1000,
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p90_ms': percentile(ordered, 0.90) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+    if nodes:
+        result['nodes_mean'] = sum(nodes) / len(nodes)
+        result['nodes_max'] = max(nodes)
+    return result
+
+
+def measure(call, items, repeat):
+    """
+    Time call(item) for every item, repeat times.
+    call returns the number of search nodes it visited, or None.
+    Returns:
+        tuple: (latencies in seconds, node counts)
+    """
+    times = []
+    nodes = []
+    for _ in range(repeat):
+        for item in items:
+            start = time.perf_counter()
+            count = call(item)
+            times.append(time.perf_counter() - start)
+            if count is not None:
+                nodes.append(count)
+    return times, nodes
+
+
+def sweep_is_valid(board):
+    # 对每个空格检查 1-9，模拟一次完整的候选数扫描
+    for row in range(9):
+        for col in range(9):
+            if board[row][col] == 0:
+                for num in range(1, 10):
+                    is_valid(board, row, col, num)
+
+
+def bench_find_constraint(board):
+    find_constraint(board)
+
+
+def make_solve(backend):
+    def solve(board):
+        stats = {}
+        find_solutions(copy.deepcopy(board), limit=1, backend=backend, stats=stats)
+        return stats['nodes']
+    return solve
+
+
+def make_unique(backend):
+    def unique(board):
+        stats = {}
+        has_unique_solution(board, backend=backend, stats=stats, use_cache=False)
+        return stats['nodes']
+    return unique
+
+
+def bench_hint(board):
+    solution_cache.clear()
+    analyze_hint(board)
+
+
+def bench_generate(difficulty):
+    stats = {}
+    generate_sudoku(difficulty, stats=stats)
+    return stats['nodes']
+
+
+def bench_generate_transform(difficulty):
+    generate_sudoku(difficulty, mode='transform')
+
+
+def bench_generate_targeted(difficulty):
+    stats = {}
+    generate_sudoku(difficulty, mode='targeted', stats=stats)
+    return stats['nodes']
+
+
+def run_suite(args):
+    """运行所有基准测试，返回 {名称: 统计结果}"""
+    corpora = {name: load_corpus(name) for name in args.corpora}
+    benchmarks = []
+    for name, boards in corpora.items():
+        benchmarks += [
+            (f'is_valid_sweep/{name}', sweep_is_valid, boards),
+            (f'find_constraint/{name}', bench_find_constraint, boards),
+            (f'solve/{name}', make_solve(args.backend), boards),
+            (f'has_unique_solution/{name}', make_unique(args.backend), boards),
+            (f'analyze_hint/{name}', bench_hint, boards),
+        ]
+    for difficulty in DIFFICULTY_RANGES:
+        benchmarks.append((f'generate_sudoku/{difficulty}', bench_generate, [difficulty] * args.generate))
+        benchmarks.append((f'generate_sudoku_transform/{difficulty}', bench_generate_transform,
+                           [difficulty] * args.generate))
+        benchmarks.append((f'generate_sudoku_targeted/{difficulty}', bench_generate_targeted,
+                           [difficulty] * args.generate))
+
+    results = {}
+    for name, call, items in benchmarks:
+        random.seed(args.seed)
+        times, nodes = measure(call, items, args.repeat)
+        results[name] = summarize(times, nodes)
+        row = results[name]
+        node_text = f"{row['nodes_mean']:>12.1f}" if 'nodes_mean' in row else f"{'-':>12}"
+        print(f"{name:<34} {row['calls']:>6} {row['p50_ms']:>9.3f} {row['p90_ms']:>9.3f} "
+              f"{row['p99_ms']:>9.3f} {row['max_ms']:>9.3f} {node_text}", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold, min_ms=0.0):
+    """
+    Compare results with a baseline.
+    Args:
+        threshold (float): Allowed relative growth of p50_ms and nodes_mean.
+        min_ms (float): Latency growth below this many milliseconds is treated as noise.
+    Returns:
+        list of str: One line per regression.
+    """
+    regressions = []
+    for name, old in baseline.items():
+        new = results.get(name)
+        if new is None:
+            continue
+        for key in ('p50_ms', 'nodes_mean'):
+            if key not in old or key not in new or old[key] <= 0:
+                continue
+            if key == 'p50_ms' and new[key] - old[key] < min_ms:
+                continue
+            if new[key] > old[key] * (1 + threshold):
+                regressions.append(f"{name} {key}: {old[key]:.3f} -> {new[key]:.3f} "
+                                   f"(+{(new[key] / old[key] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Sudoku solver, generator and hints")
+    parser.add_argument('-o', '--output', help="write JSON results to this file")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="allowed relative slowdown")
+    parser.add_argument('--min-ms', type=float, default=0.5, help="ignore latency changes smaller than this")
+    parser.add_argument('--seed', type=int, default=2025)
+    parser.add_argument('--repeat', type=int, default=3, help="passes over every corpus")
+    parser.add_argument('--generate', type=int, default=10, help="puzzles generated per difficulty")
+    parser.add_argument('--backend', default=DEFAULT_BACKEND)
+    parser.add_argument('--corpora', default=','.join(CORPORA))
+    args = parser.parse_args()
+    args.corpora = args.corpora.split(',')
+
+    print(f"{'benchmark':<34} {'calls':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'nodes':>12}",
+          file=sys.stderr)
+    results = run_suite(args)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'generate': args.generate,
+            'backend': args.backend,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold, args.min_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("no regressions", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
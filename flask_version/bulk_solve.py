@@ -0,0 +1,130 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Streaming bulk solver for large puzzle files.
+
+Usage:
+    python bulk_solve.py puzzles.txt -o solutions.txt [--workers N] [--chunk-size N]
+
+The input file is memory-mapped and scanned for digits; newlines, '/' and spaces are ignored
+like in string_to_board, so every 81 digits form one puzzle. Puzzles are solved in parallel
+chunks and written in input order, one line per puzzle: the 81-digit solution, or
+"no or multiple solutions". Only a bounded number of chunks is in flight at a time, so memory
+stays flat regardless of file size. Throughput is reported on stderr.
+"""
+
+import argparse
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+
+from functions import string_to_board
+from sudoku_solver import find_solutions, board_key
+
+NO_UNIQUE_SOLUTION = "no or multiple solutions"
+
+# string_to_board 允许的分隔符
+_SEPARATORS = b"\n\r/ "
+
+
+def iter_puzzles(buffer, block_size=1 << 20):
+    """
+    Split a buffer into 81-digit puzzle strings, skipping separators.
+    Args:
+        buffer (bytes-like): The input, e.g. an mmap object; it is read one block at a time.
+        block_size (int): Bytes copied out of the buffer per step.
+    Yields:
+        str: One puzzle per 81 digits.
+    Raises:
+        ValueError: On a character that is neither a digit nor a separator, or a trailing partial puzzle.
+    """
+    carry = b""
+    for start in range(0, len(buffer), block_size):
+        data = carry + buffer[start:start + block_size].translate(None, _SEPARATORS)
+        if data and not data.isdigit():
+            raise ValueError(f"Invalid character in block starting at byte {start}.")
+        usable = len(data) - len(data) % 81
+        for offset in range(0, usable, 81):
+            yield data[offset:offset + 81].decode()
+        carry = data[usable:]
+    if carry:
+        raise ValueError(f"Input ends with a partial puzzle of {len(carry)} digits.")
+
+
+def iter_chunks(puzzles, size):
+    """把谜题流切成每块 size 个的列表"""
+    chunk = []
+    for puzzle in puzzles:
+        chunk.append(puzzle)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_chunk(chunk):
+    """
+    Solve a list of puzzle strings.
+    Returns:
+        list of str: The 81-digit solution or NO_UNIQUE_SOLUTION for every puzzle.
+    """
+    results = []
+    for puzzle in chunk:
+        solutions = find_solutions(string_to_board(puzzle), limit=2)
+        results.append(board_key(solutions[0]) if len(solutions) == 1 else NO_UNIQUE_SOLUTION)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a large file of Sudoku puzzles")
+    parser.add_argument('input', help="puzzle file")
+    parser.add_argument('-o', '--output', default='-', help="output file ('-' for stdout)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=1000, help="puzzles per task")
+    args = parser.parse_args()
+
+    target = sys.stdout if args.output == '-' else open(args.output, 'w')
+    solved = 0
+    start = time.perf_counter()
+    with open(args.input, 'rb') as f, multiprocessing.Pool(args.workers) as pool:
+        if os.fstat(f.fileno()).st_size == 0:
+            buffer = b""
+        else:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # 最多同时提交 2 * workers 个块，按提交顺序取回结果
+        pending = deque()
+        chunks = iter_chunks(iter_puzzles(buffer), args.chunk_size)
+        try:
+            while True:
+                while len(pending) < 2 * args.workers:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    pending.append(pool.apply_async(solve_chunk, (chunk,)))
+                if not pending:
+                    break
+                results = pending.popleft().get()
+                target.write("\n".join(results) + "\n")
+                solved += len(results)
+        except ValueError as e:
+            sys.exit(f"error after {solved} puzzles: {e}")
+        finally:
+            if buffer:
+                buffer.close()
+
+    target.flush()
+    if target is not sys.stdout:
+        target.close()
+    elapsed = time.perf_counter() - start
+    rate = solved / elapsed if elapsed else 0.0
+    print(f"solved {solved} puzzles in {elapsed:.2f}s ({rate:.1f} puzzles/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Exact-cover (Dancing Links / Algorithm X) Sudoku solver.
+
+A Sudoku is an exact-cover problem with 324 constraint columns (every cell holds one number,
+every row/column/box holds every digit once) and 729 candidate rows (digit d in cell (r, c)).
+The matrix is kept in flat integer arrays (left/right/up/down links) that are built once
+and copied for every solve, so the search itself never allocates.
+"""
+
+_ROOT = 0
+_COLUMNS = 324
+_FIRST_NODE = _COLUMNS + 1
+
+
+def _constraint_columns(row, col, num):
+    """返回候选 (row, col, num) 覆盖的 4 个约束列"""
+    box = (row // 3) * 3 + col // 3
+    d = num - 1
+    return (
+        1 + row * 9 + col,
+        1 + 81 + row * 9 + d,
+        1 + 162 + col * 9 + d,
+        1 + 243 + box * 9 + d,
+    )
+
+
+def _build_template():
+    """构建完整的 729 x 324 精确覆盖矩阵"""
+    left = [0] * _FIRST_NODE
+    right = [0] * _FIRST_NODE
+    up = list(range(_FIRST_NODE))
+    down = list(range(_FIRST_NODE))
+    column = list(range(_FIRST_NODE))
+    size = [0] * _FIRST_NODE
+    row_id = [-1] * _FIRST_NODE
+
+    for c in range(_FIRST_NODE):
+        left[c] = c - 1 if c > 0 else _COLUMNS
+        right[c] = c + 1 if c < _COLUMNS else _ROOT
+
+    for row in range(9):
+        for col in range(9):
+            for num in range(1, 10):
+                rid = row * 81 + col * 9 + num - 1
+                first = len(left)
+                for k, c in enumerate(_constraint_columns(row, col, num)):
+                    node = first + k
+                    left.append(first + (k - 1) % 4)
+                    right.append(first + (k + 1) % 4)
+                    up.append(up[c])
+                    down.append(c)
+                    down[up[c]] = node
+                    up[c] = node
+                    column.append(c)
+                    row_id.append(rid)
+                    size[c] += 1
+
+    return left, right, up, down, column, size, row_id
+
+
+_TEMPLATE = _build_template()
+
+
+class _Matrix:
+    """一次求解使用的可变链接数组"""
+
+    def __init__(self):
+        left, right, up, down, column, size, row_id = _TEMPLATE
+        self.left = left[:]
+        self.right = right[:]
+        self.up = up[:]
+        self.down = down[:]
+        self.size = size[:]
+        self.column = column
+        self.row_id = row_id
+        self.nodes = 0
+        self.budget = None
+
+    def cover(self, c):
+        left, right, up, down, size, column = self.left, self.right, self.up, self.down, self.size, self.column
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, c):
+        left, right, up, down, size, column = self.left, self.right, self.up, self.down, self.size, self.column
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = c
+        left[right[c]] = c
+
+    def search(self, partial, limit, solutions):
+        """Algorithm X：每次选择剩余行数最少的列。找到 limit 个解时返回 True"""
+        right, down, size, column, row_id = self.right, self.down, self.size, self.column, self.row_id
+        self.nodes += 1
+        if self.budget is not None:
+            self.budget.charge()
+        if right[_ROOT] == _ROOT:
+            solutions.append(list(partial))
+            return len(solutions) >= limit
+
+        best = right[_ROOT]
+        best_size = size[best]
+        c = right[best]
+        while c != _ROOT and best_size > 1:
+            if size[c] < best_size:
+                best, best_size = c, size[c]
+            c = right[c]
+        if best_size == 0:
+            return False
+
+        self.cover(best)
+        done = False
+        r = down[best]
+        while r != best:
+            partial.append(row_id[r])
+            j = right[r]
+            while j != r:
+                self.cover(column[j])
+                j = right[j]
+            done = self.search(partial, limit, solutions)
+            j = self.left[r]
+            while j != r:
+                self.uncover(column[j])
+                j = self.left[j]
+            partial.pop()
+            if done:
+                break
+            r = down[r]
+        self.uncover(best)
+        return done
+
+
+def dlx_solutions(board, limit=2, stats=None, budget=None):
+    """
+    使用 Dancing Links 查找数独的解，最多找到 limit 个
+    Args:
+        board: 数独棋盘（二维列表，0 表示空格），不会被修改
+        limit: 解的数量上限
+        stats (dict, optional): 搜索节点数累加到 stats['nodes']
+        budget (SearchBudget, optional): 搜索预算，用完时抛出 BudgetExceeded
+    Returns:
+        list: 解的列表，每个解是一个新的二维列表
+    """
+    matrix = _Matrix()
+    matrix.budget = budget
+    covered = set()
+
+    # 先选中所有已知数字所在的行
+    for row in range(9):
+        for col in range(9):
+            num = board[row][col]
+            if not num:
+                continue
+            columns = _constraint_columns(row, col, num)
+            if covered.intersection(columns):
+                # 已知数字之间互相冲突，无解
+                return []
+            covered.update(columns)
+            for c in columns:
+                matrix.cover(c)
+
+    partial = []
+    raw_solutions = []
+    try:
+        matrix.search(partial, limit, raw_solutions)
+    finally:
+        if stats is not None:
+            stats['nodes'] = stats.get('nodes', 0) + matrix.nodes
+
+    solutions = []
+    for rows in raw_solutions:
+        solution = [line[:] for line in board]
+        for rid in rows:
+            solution[rid // 81][rid // 9 % 9] = rid % 9 + 1
+        solutions.append(solution)
+    return solutions
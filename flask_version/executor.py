@@ -0,0 +1,167 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Process-pool executor with per-call deadlines for CPU-bound puzzle generation and solving.
+
+Calls run in worker processes so they use every core and never hold the request thread's GIL.
+Workers are forked, so they inherit the already imported solver modules; call start() before
+any background threads are started so the fork happens in a single-threaded process.
+If a worker dies, the broken pool is replaced from a request thread while other threads run, so
+the replacement uses the forkserver (or spawn) start method instead of forking this process.
+Each call carries an absolute deadline: a call still queued at its deadline is cancelled, and a
+running call is interrupted inside the worker by a SIGALRM timer, so the worker is freed as well.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+# 父进程在截止时间之后额外等待的时间，用于接收工作进程自己抛出的超时异常
+_GRACE_SECONDS = 0.5
+# 替换损坏的进程池时已有其他线程在运行，不能再 fork 当前进程
+_RESTART_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class DeadlineExceeded(Exception):
+    """The call did not finish before its deadline."""
+
+
+def _on_alarm(signum, frame):
+    raise DeadlineExceeded()
+
+
+def _ping():
+    return True
+
+
+def _call_with_deadline(fn, args, deadline):
+    """在工作进程中执行 fn(*args)，到达截止时间时中断"""
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise DeadlineExceeded()
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        return fn(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class SolverExecutor:
+    """
+    Runs module-level functions in a lazily created process pool.
+    Attributes:
+        workers (int): Number of worker processes; 0 runs calls inline without a deadline.
+        initializer (callable): Module-level function every worker process runs before its first call.
+        start_method (str): How the next pool starts its workers; 'fork' until a pool breaks.
+    """
+
+    def __init__(self, workers=None, initializer=None):
+        """
+        Initialize the executor.
+        Args:
+            workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            initializer (callable, optional): Run in every worker process before its first call, e.g. to
+                reset state inherited from the parent by fork.
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.initializer = initializer
+        self.start_method = 'fork'
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                context = multiprocessing.get_context(self.start_method)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                                 initializer=self.initializer)
+            return self._pool
+
+    def start(self):
+        """
+        Fork the worker processes now instead of on the first call.
+        """
+        if self.workers > 0:
+            # 使用 fork 时，第一次提交任务会一次性创建所有工作进程
+            self._get_pool().submit(_ping).result()
+
+    def _reset_pool(self, pool):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+                self.start_method = _RESTART_METHOD
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, fn, *args, timeout):
+        """
+        Run fn(*args) in a worker process and wait for the result.
+        Args:
+            fn (callable): A picklable (module-level) function.
+            *args: Positional arguments for fn.
+            timeout (float): Seconds the call may take, including time spent queued.
+        Returns:
+            The return value of fn.
+        Raises:
+            DeadlineExceeded: If the call did not finish in time.
+        """
+        if self.workers <= 0:
+            return fn(*args)
+
+        deadline = time.time() + timeout
+        pool = self._get_pool()
+        try:
+            future = pool.submit(_call_with_deadline, fn, args, deadline)
+            return future.result(timeout=timeout + _GRACE_SECONDS)
+        except FutureTimeoutError:
+            # 仍在排队的任务直接取消；正在运行的任务会被工作进程内的定时器中断
+            future.cancel()
+            raise DeadlineExceeded()
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            raise
+
+    def run_all(self, fn, calls, timeout):
+        """
+        Run fn(*args) for every args in calls in parallel across the workers, with one shared deadline.
+        Args:
+            fn (callable): A picklable (module-level) function.
+            calls (list of tuple): Positional arguments of each call.
+            timeout (float): Seconds all calls may take, including time spent queued.
+        Returns:
+            list: For each call its return value, or a DeadlineExceeded instance if it did not finish in time.
+        """
+        if self.workers <= 0:
+            return [fn(*args) for args in calls]
+
+        deadline = time.time() + timeout
+        pool = self._get_pool()
+        try:
+            futures = [pool.submit(_call_with_deadline, fn, args, deadline) for args in calls]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result(timeout=max(deadline + _GRACE_SECONDS - time.time(), 0)))
+                except (FutureTimeoutError, DeadlineExceeded):
+                    # 超时只影响这一个调用，其余调用的结果照常返回
+                    future.cancel()
+                    results.append(DeadlineExceeded())
+            return results
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            raise
+
+    def shutdown(self):
+        """
+        Stop the worker processes.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
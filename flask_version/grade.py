@@ -0,0 +1,118 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Offline difficulty grader for puzzle corpora.
+
+Usage:
+    python grade.py puzzles.txt -o grades.csv [--workers N] [--batch-size N]
+
+The input has one puzzle per line in any form string_to_board accepts ('-' reads stdin).
+Each puzzle is rated by the hardest technique logic needs to solve it (or 'search' if logic gets
+stuck) and by the number of search nodes of the two-solution uniqueness check. The input is read
+and graded in bounded batches on a process pool and every batch is written before the next
+one is read, so memory stays flat for corpora of any size.
+"""
+
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+
+from functions import string_to_board
+from sudoku_solver import count_solutions
+from techniques import logical_solve
+
+# 最难技巧 -> 难度等级（与 generate_sudoku 的难度名称一致，无法只靠逻辑解出的为 expert）
+LEVELS = {
+    None: 'easy',
+    'naked_single': 'easy',
+    'hidden_single': 'easy',
+    'locked_candidates': 'medium',
+    'naked_pair': 'medium',
+    'hidden_pair': 'medium',
+    'x_wing': 'hard',
+    'search': 'expert',
+}
+
+FIELDS = ['line', 'puzzle', 'clues', 'solutions', 'level', 'hardest', 'logic_steps', 'search_nodes', 'error']
+
+
+def grade_puzzle(item):
+    """
+    Grade one puzzle.
+    Args:
+        item (tuple): (line number, puzzle string).
+    Returns:
+        dict: One output row (see FIELDS).
+    """
+    number, text = item
+    result = {'line': number, 'puzzle': text.strip()}
+    try:
+        board = string_to_board(text.strip())
+    except ValueError as e:
+        result['error'] = str(e)
+        return result
+
+    stats = {}
+    solutions = count_solutions(board, limit=2, stats=stats)
+    logic = logical_solve(board)
+    hardest = logic['hardest'] if logic['solved'] else 'search'
+    result.update({
+        'clues': sum(1 for row in board for num in row if num),
+        'solutions': solutions,
+        'level': LEVELS[hardest] if solutions == 1 else '',
+        'hardest': hardest or '',
+        'logic_steps': logic['steps'],
+        'search_nodes': stats['nodes'],
+    })
+    return result
+
+
+def read_puzzles(stream):
+    """逐行读取，跳过空行和 # 注释，产生 (行号, 内容)"""
+    for number, line in enumerate(stream, 1):
+        if line.strip() and not line.lstrip().startswith('#'):
+            yield number, line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade Sudoku puzzles by technique and solver effort")
+    parser.add_argument('input', help="puzzle file, one puzzle per line ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="CSV output file ('-' for stdout)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--batch-size', type=int, default=4096, help="puzzles read and graded per batch")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    writer = csv.DictWriter(target, fieldnames=FIELDS)
+    writer.writeheader()
+
+    puzzles = read_puzzles(source)
+    chunksize = max(1, args.batch_size // (args.workers * 4))
+    graded = 0
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.workers) as pool:
+        while True:
+            batch = list(itertools.islice(puzzles, args.batch_size))
+            if not batch:
+                break
+            for row in pool.imap(grade_puzzle, batch, chunksize):
+                writer.writerow(row)
+            target.flush()
+            graded += len(batch)
+            elapsed = time.perf_counter() - start
+            print(f"graded {graded} puzzles, {graded / elapsed:.1f}/s", file=sys.stderr)
+
+    if source is not sys.stdin:
+        source.close()
+    if target is not sys.stdout:
+        target.close()
+
+
+if __name__ == '__main__':
+    main()
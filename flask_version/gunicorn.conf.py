@@ -0,0 +1,37 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Gunicorn configuration: the master imports and warms up the app once, then forks the workers,
+which share the warmed state copy-on-write and start their own background work after the fork.
+
+Usage:
+    gunicorn -c gunicorn.conf.py
+"""
+
+import os
+
+# app.py 看到这个变量时不在导入时启动后台任务
+os.environ['SUDOKU_PRELOAD'] = '1'
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+# 单个 worker 用多线程接收请求，计算交给求解进程池
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+preload_app = True
+wsgi_app = f'app:create_app(start=False, shares={workers})'
+
+
+def when_ready(server):
+    import app
+    server.log.info("app ready, startup times: %s",
+                    {phase: round(seconds, 3) for phase, seconds in app.startup_times.items()})
+
+
+def post_fork(server, worker):
+    import app
+    # worker.age 从 1 开始逐个递增；master 保留着预生成的谜题，重启的 worker 再取会重复出题，
+    # 所以只有第一批 worker 各取一份，之后的 worker 从空池开始
+    share = worker.age - 1 if worker.age <= server.cfg.workers else None
+    app.start_background(share=share, shares=server.cfg.workers)
@@ -0,0 +1,185 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+In-process metrics in the Prometheus text exposition format.
+
+Counters and histograms are kept in plain dicts under one lock, so recording a value costs a
+dict update. Code running in solver worker processes records into that process's registry;
+collect() wraps such a call and returns the recorded values with the result, and the web
+process merges them into its own registry. Forked workers start with a copy of the web process's
+registry, so they must call reset_metrics() before their first call (see SolverExecutor's
+initializer), or the copied values would be merged back a second time.
+"""
+
+from bisect import bisect_left
+import threading
+
+# 延迟直方图的桶上限（秒）
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 指标名称 -> (类型, 说明)
+DESCRIPTIONS = {
+    'sudoku_http_requests_total': ('counter', "HTTP requests by route, method and status."),
+    'sudoku_http_request_duration_seconds': ('histogram', "HTTP request latency by route and method."),
+    'sudoku_generator_puzzles_total': ('counter', "Puzzles generated by difficulty."),
+    'sudoku_generator_fill_attempts_total': ('counter', "Numbers tried while filling the complete grid."),
+    'sudoku_generator_removals_tried_total': ('counter', "Clue removals tried while digging holes."),
+    'sudoku_generator_removals_rejected_total': ('counter', "Clue removals undone because the solution was no longer unique."),
+    'sudoku_generator_nodes_total': ('counter', "Search nodes of the uniqueness checks while digging holes."),
+    'sudoku_generator_phase_seconds': ('histogram', "Time spent per generator phase (fill, dig, or targeted for generate_with_clues)."),
+    'sudoku_generator_fallbacks_total': ('counter', "Dig-out generations that stopped above the difficulty's clue range and were redone with generate_with_clues."),
+    'sudoku_generator_target_missed_total': ('counter', "generate_with_clues runs that used up their check budget above the target clue count."),
+    'sudoku_solver_searches_total': ('counter', "Uncached count_solutions searches (has_unique_solution uses limit 2)."),
+    'sudoku_solver_nodes_total': ('counter', "Search nodes of count_solutions by backend."),
+    'sudoku_solver_search_seconds': ('histogram', "Time per uncached count_solutions search."),
+    'sudoku_startup_seconds': ('gauge', "Duration of each start-up phase of this process."),
+    'sudoku_solve_path_lookups_total': ('counter', "Hint lookups in recorded solve paths by result (hit, miss, mismatch or search)."),
+    'sudoku_search_budget_exhausted_total': ('counter', "Searches aborted because their node or time budget ran out."),
+}
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+
+class Metrics:
+    """
+    A registry of labelled counters and histograms.
+    Labels are passed as keyword arguments and stored as a sorted tuple of (name, value) pairs.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Initialize an empty registry.
+        Args:
+            buckets (tuple): Upper bounds of the histogram buckets in ascending order.
+        """
+        self.buckets = tuple(buckets)
+        self._counters = {}    # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+        self._gauges = {}      # (name, labels) -> value，只属于当前进程，不参与 drain/merge
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        """
+        Add value to a counter.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """
+        Set a gauge.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name, value, **labels):
+        """
+        Record one value in a histogram.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 3)
+            histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def drain(self):
+        """
+        Take all recorded values and reset the registry.
+        Returns:
+            tuple: (counters, histograms) that can be passed to merge().
+        """
+        with self._lock:
+            delta = (self._counters, self._histograms)
+            self._counters = {}
+            self._histograms = {}
+        return delta
+
+    def reset(self):
+        """
+        Remove all recorded values, including gauges.
+        """
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+            self._gauges = {}
+
+    def merge(self, delta):
+        """
+        Add values returned by drain(), e.g. from a worker process.
+        """
+        counters, histograms = delta
+        with self._lock:
+            for key, value in counters.items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for key, values in histograms.items():
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    self._histograms[key] = list(values)
+                else:
+                    for index, value in enumerate(values):
+                        histogram[index] += value
+
+    def render(self):
+        """
+        Format all metrics in the Prometheus text exposition format.
+        Returns:
+            str: The metrics page.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            counters.update(self._gauges)
+            histograms = {key: list(values) for key, values in self._histograms.items()}
+
+        names = sorted({name for name, _ in counters} | {name for name, _ in histograms})
+        lines = []
+        for name in names:
+            kind, description = DESCRIPTIONS.get(name, ('untyped', ''))
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+            for (metric, labels), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), values):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {values[-2]}")
+                lines.append(f"{name}_count{_format_labels(labels)} {values[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+# 每个进程一个全局注册表
+metrics = Metrics()
+
+
+def reset_metrics():
+    """
+    Empty the registry of this process; the initializer of the solver worker processes.
+    """
+    metrics.reset()
+
+
+def collect(fn, *args):
+    """
+    Call fn(*args) and return its result together with the metrics it recorded.
+    Meant to run in a solver worker process; pass the second value to metrics.merge().
+    Returns:
+        tuple: (result, delta)
+    """
+    result = fn(*args)
+    return result, metrics.drain()
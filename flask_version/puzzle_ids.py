@@ -0,0 +1,106 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Compact puzzle IDs that deterministically identify a generated puzzle.
+
+An ID is the difficulty code followed by the seed in base 36, e.g. "m3k9x2a" for a medium
+puzzle. generate_from_id() always builds the same board and solution for the same ID, so
+responses for an ID never change and can be cached by browsers and proxies. Bump
+PUZZLE_ID_VERSION whenever a change to generate_sudoku alters its output for a given seed;
+the version is part of the ETag, so cached copies are then revalidated.
+"""
+
+import hashlib
+import random
+import re
+
+from sudoku_generator import generate_sudoku
+from wire import encode_string
+
+PUZZLE_ID_VERSION = 2
+
+# 编号生成谜题固定使用的生成方式，与 SUDOKU_GENERATOR_MODE 无关，保证同一编号结果不变
+PUZZLE_ID_MODE = 'incremental'
+
+DIFFICULTY_CODES = {'easy': 'e', 'medium': 'm', 'hard': 'h'}
+CODE_DIFFICULTIES = {code: difficulty for difficulty, code in DIFFICULTY_CODES.items()}
+
+# 种子最多 64 位，base36 最多 13 个字符
+_ID_PATTERN = re.compile(r'^([emh])([0-9a-z]{1,13})$')
+_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+_MAX_SEED = (1 << 64) - 1
+
+
+def make_puzzle_id(difficulty, seed):
+    """
+    Build the ID of a puzzle.
+    Args:
+        difficulty (str): 'easy', 'medium' or 'hard'.
+        seed (int): A seed between 0 and 2^64 - 1.
+    Returns:
+        str: The puzzle ID.
+    """
+    if difficulty not in DIFFICULTY_CODES or not 0 <= seed <= _MAX_SEED:
+        raise ValueError("Invalid difficulty or seed.")
+    digits = ''
+    while True:
+        seed, digit = divmod(seed, 36)
+        digits = _DIGITS[digit] + digits
+        if not seed:
+            break
+    return DIFFICULTY_CODES[difficulty] + digits
+
+
+def parse_puzzle_id(puzzle_id):
+    """
+    Split a puzzle ID into difficulty and seed.
+    Returns:
+        tuple: (difficulty, seed)
+    Raises:
+        ValueError: If the ID is malformed.
+    """
+    match = _ID_PATTERN.match(puzzle_id or '')
+    if match is None:
+        raise ValueError("Invalid puzzle ID.")
+    seed = int(match.group(2), 36)
+    if seed > _MAX_SEED:
+        raise ValueError("Invalid puzzle ID.")
+    return CODE_DIFFICULTIES[match.group(1)], seed
+
+
+def daily_puzzle_id(date, difficulty):
+    """
+    Get the ID of the daily challenge; everybody gets the same puzzle on the same day.
+    Args:
+        date (datetime.date): The day.
+        difficulty (str): The difficulty.
+    """
+    return make_puzzle_id(difficulty, date.year * 10000 + date.month * 100 + date.day)
+
+
+def puzzle_etag(puzzle_id):
+    """
+    Get the strong ETag (without quotes) of a puzzle; it depends only on the ID and PUZZLE_ID_VERSION.
+    """
+    return f'{puzzle_id}.v{PUZZLE_ID_VERSION}'
+
+
+def content_puzzle_id(board):
+    """
+    Get the ID of a puzzle that was not generated from an ID, e.g. one from the puzzle pool.
+    It is derived from the clues, so it names the puzzle but cannot be passed to generate_from_id.
+    """
+    return 'g' + hashlib.blake2b(encode_string(board).encode('ascii'), digest_size=8).hexdigest()
+
+
+def generate_from_id(puzzle_id):
+    """
+    Generate the puzzle identified by an ID.
+    Returns:
+        tuple: (board, solution), always the same for the same ID.
+    Raises:
+        ValueError: If the ID is malformed.
+    """
+    difficulty, seed = parse_puzzle_id(puzzle_id)
+    return generate_sudoku(difficulty, mode=PUZZLE_ID_MODE, rng=random.Random(seed))
@@ -0,0 +1,181 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Pool of pre-generated puzzles per difficulty, refilled by background worker threads.
+"""
+
+from collections import deque
+import threading
+import time
+
+
+class PuzzlePool:
+    """
+    A per-difficulty queue of ready puzzles in the form generate returns.
+
+    When the depth of a difficulty drops to low_watermark, the workers start generating
+    puzzles for it and keep going until it reaches high_watermark.
+    Attributes:
+        low_watermark (int): Depth at or below which refilling starts.
+        high_watermark (int): Depth at which refilling stops.
+    """
+
+    def __init__(self, generate, difficulties, low_watermark=2, high_watermark=10, workers=1,
+                 retry_delay=0.5, max_retry_delay=30.0):
+        """
+        Initialize the pool.
+        Args:
+            generate (callable): generate(difficulty) -> (board, solution, ...).
+            difficulties (iterable of str): The difficulties to keep puzzles for.
+            low_watermark (int): Depth at or below which refilling starts.
+            high_watermark (int): Depth at which refilling stops.
+            workers (int): Number of background worker threads.
+            retry_delay (float): Seconds a worker waits after a failed generate; doubled after every
+                further failure in a row, up to max_retry_delay.
+            max_retry_delay (float): Longest wait between retries.
+        """
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self._generate = generate
+        self._workers = workers
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._queues = {difficulty: deque() for difficulty in difficulties}
+        self._refilling = {difficulty: True for difficulty in self._queues}
+        self._in_flight = {difficulty: 0 for difficulty in self._queues}
+        self._counters = {
+            difficulty: {'generated': 0, 'served': 0, 'misses': 0, 'errors': 0, 'generate_seconds': 0.0}
+            for difficulty in self._queues
+        }
+        self._condition = threading.Condition()
+        self._threads = []
+        self._stopped = False
+
+    def start(self):
+        """
+        Start the background worker threads.
+        """
+        if self._threads or self.high_watermark <= 0:
+            return
+        for i in range(self._workers):
+            thread = threading.Thread(target=self._run, name=f"puzzle-pool-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def seed(self, difficulty, puzzles):
+        """
+        Add puzzles generated elsewhere, e.g. during start-up.
+        Args:
+            difficulty (str): The difficulty of the puzzles.
+            puzzles (iterable): Puzzles in the form generate returns.
+        """
+        with self._condition:
+            queue = self._queues.get(difficulty)
+            if queue is None:
+                return
+            queue.extend(puzzles)
+            if len(queue) >= self.high_watermark:
+                self._refilling[difficulty] = False
+
+    def stop(self):
+        """
+        Ask the worker threads to exit and wait for them.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def get(self, difficulty):
+        """
+        Take a ready puzzle from the pool.
+        Args:
+            difficulty (str): The requested difficulty.
+        Returns:
+            tuple: A puzzle from generate, or None if no puzzle of that difficulty is ready.
+        """
+        with self._condition:
+            queue = self._queues.get(difficulty)
+            if queue is None:
+                return None
+            counters = self._counters[difficulty]
+            if not queue:
+                counters['misses'] += 1
+                puzzle = None
+            else:
+                counters['served'] += 1
+                puzzle = queue.popleft()
+            if len(queue) <= self.low_watermark and not self._refilling[difficulty]:
+                self._refilling[difficulty] = True
+                self._condition.notify_all()
+            return puzzle
+
+    def stats(self):
+        """
+        Get the pool depth and refill statistics of every difficulty.
+        Returns:
+            dict: difficulty -> {depth, refilling, generated, served, misses, errors, refill_rate}.
+                  refill_rate is the number of puzzles generated per second of worker time.
+        """
+        with self._condition:
+            result = {}
+            for difficulty, queue in self._queues.items():
+                counters = dict(self._counters[difficulty])
+                seconds = counters.pop('generate_seconds')
+                counters['depth'] = len(queue)
+                counters['refilling'] = self._refilling[difficulty]
+                counters['refill_rate'] = round(counters['generated'] / seconds, 3) if seconds else 0.0
+                result[difficulty] = counters
+            return result
+
+    def _next_job(self):
+        """选择正在补充且库存最少的难度；没有任务时返回 None（调用时需持有锁）"""
+        best = None
+        for difficulty, queue in self._queues.items():
+            if not self._refilling[difficulty]:
+                continue
+            depth = len(queue) + self._in_flight[difficulty]
+            if depth >= self.high_watermark:
+                continue
+            if best is None or depth < len(self._queues[best]) + self._in_flight[best]:
+                best = difficulty
+        return best
+
+    def _run(self):
+        delay = self.retry_delay
+        while True:
+            with self._condition:
+                difficulty = self._next_job()
+                while difficulty is None and not self._stopped:
+                    self._condition.wait()
+                    difficulty = self._next_job()
+                if self._stopped:
+                    return
+                self._in_flight[difficulty] += 1
+
+            start = time.perf_counter()
+            try:
+                puzzle = self._generate(difficulty)
+            except Exception:
+                puzzle = None
+            elapsed = time.perf_counter() - start
+
+            with self._condition:
+                self._in_flight[difficulty] -= 1
+                counters = self._counters[difficulty]
+                counters['generate_seconds'] += elapsed
+                if puzzle is None:
+                    counters['errors'] += 1
+                    # 生成持续失败时（例如求解进程池损坏）不要立即重试，逐步延长等待时间
+                    self._condition.wait_for(lambda: self._stopped, timeout=delay)
+                    delay = min(delay * 2, self.max_retry_delay)
+                    continue
+                delay = self.retry_delay
+                counters['generated'] += 1
+                queue = self._queues[difficulty]
+                queue.append(puzzle)
+                if len(queue) >= self.high_watermark:
+                    self._refilling[difficulty] = False
@@ -0,0 +1,108 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Bounded in-process LRU cache with TTL for solver results.
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class LRUCache:
+    """
+    A thread-safe least-recently-used cache whose entries also expire after ttl seconds.
+    Attributes:
+        maxsize (int): Maximum number of entries; 0 disables the cache.
+        ttl (float): Seconds an entry stays valid; None keeps entries until they are evicted.
+        hits, misses, evictions, expirations (int): Counters since creation.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        """
+        Initialize the cache.
+        Args:
+            maxsize (int): Maximum number of entries.
+            ttl (float, optional): Seconds an entry stays valid.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Look up a key and mark it as recently used.
+        Args:
+            key: The cache key.
+            default: Returned when the key is missing or expired.
+        Returns:
+            The cached value or default.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """
+        Store a value, evicting the least recently used entries beyond maxsize.
+        Args:
+            key: The cache key.
+            value: The value; should be immutable since it is shared between callers.
+        """
+        if self.maxsize <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Remove all entries. Counters are kept.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        # 只检查是否存在且未过期，不计入命中统计，也不调整使用顺序
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def stats(self):
+        """
+        Get the cache counters.
+        Returns:
+            dict: size, maxsize, ttl, hits, misses, evictions and expirations.
+        """
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
@@ -0,0 +1,67 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Node and wall-clock budgets for solver searches on user-supplied boards.
+"""
+
+import time
+
+# 每隔多少个节点检查一次时间
+_CLOCK_INTERVAL = 64
+
+
+class BudgetExceeded(Exception):
+    """
+    The search ran out of its budget before it could decide.
+    Attributes:
+        reason (str): 'nodes' or 'time'.
+    """
+
+    def __init__(self, reason):
+        super().__init__(f"search budget exceeded ({reason})")
+        self.reason = reason
+
+
+class SearchBudget:
+    """
+    Limits on the work of one search. The clock starts at the first visited node, so a budget
+    can be created in one process and spent in another.
+    Attributes:
+        max_nodes (int): Maximum number of search nodes; None for no limit.
+        max_seconds (float): Maximum wall-clock seconds; None for no limit.
+        nodes (int): Nodes charged so far.
+    """
+
+    def __init__(self, max_nodes=None, max_seconds=None):
+        """
+        Initialize the budget.
+        Args:
+            max_nodes (int, optional): Node limit.
+            max_seconds (float, optional): Time limit in seconds.
+        """
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.nodes = 0
+        self._deadline = None
+
+    def renew(self):
+        """
+        Get an unused budget with the same limits.
+        """
+        return SearchBudget(self.max_nodes, self.max_seconds)
+
+    def charge(self):
+        """
+        Count one search node.
+        Raises:
+            BudgetExceeded: If the node or time limit has been reached.
+        """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise BudgetExceeded('nodes')
+        if self.max_seconds is not None:
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.max_seconds
+            elif self.nodes % _CLOCK_INTERVAL == 0 and time.monotonic() > self._deadline:
+                raise BudgetExceeded('time')
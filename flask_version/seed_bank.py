@@ -0,0 +1,141 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Seed bank of vetted puzzles and the symmetry transformations used to derive new puzzles from them.
+
+Relabeling the digits, permuting the rows inside a band and the columns inside a stack, permuting
+the bands and the stacks, and transposing all map a valid grid to a valid grid, so they keep the
+number of solutions and the number of clues of a puzzle. One seed therefore stands for up to
+9! * 6^8 * 2 (about 1.2 * 10^12) different-looking puzzles of the same difficulty.
+
+Usage (rebuild the bank):
+    python seed_bank.py [-o seed_bank.txt] [--count N]
+
+Every line of the bank is "<difficulty> <puzzle> <solution>" with 81-digit strings; lines
+starting with '#' are comments.
+"""
+
+import argparse
+import os
+import random
+import threading
+
+from functions import string_to_board, board_to_string
+
+SEED_BANK_PATH = os.environ.get(
+    'SUDOKU_SEED_BANK', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seed_bank.txt'))
+
+_banks = {}
+_lock = threading.Lock()
+
+
+def load_seed_bank(path=None):
+    """
+    Load a seed bank file; every file is read only once per process.
+    Args:
+        path (str, optional): The file. Defaults to SEED_BANK_PATH.
+    Returns:
+        dict: difficulty -> list of (board, solution); empty if the file does not exist.
+    """
+    path = path or SEED_BANK_PATH
+    with _lock:
+        bank = _banks.get(path)
+        if bank is None:
+            bank = {}
+            if os.path.exists(path):
+                with open(path) as f:
+                    for line in f:
+                        if not line.strip() or line.startswith('#'):
+                            continue
+                        difficulty, puzzle, solution = line.split()
+                        bank.setdefault(difficulty, []).append((string_to_board(puzzle), string_to_board(solution)))
+            _banks[path] = bank
+        return bank
+
+
+def random_transform(rng=random):
+    """
+    Draw a random element of the Sudoku symmetry group.
+    Args:
+        rng (random.Random): The random number generator.
+    Returns:
+        tuple: (rows, cols, digits, transpose) where cell (i, j) of the result is taken from cell
+               (rows[i], cols[j]) of the original, digit n becomes digits[n] and the result is
+               transposed if transpose is True.
+    """
+    def lines():
+        bands = rng.sample(range(3), 3)
+        return [band * 3 + offset for band in bands for offset in rng.sample(range(3), 3)]
+
+    digits = [0] + rng.sample(range(1, 10), 9)
+    return lines(), lines(), digits, rng.random() < 0.5
+
+
+def apply_transform(board, transform):
+    """
+    Apply a transformation from random_transform to a board.
+    Args:
+        board (list of list of int): The 9x9 board; it is not modified.
+        transform (tuple): (rows, cols, digits, transpose).
+    Returns:
+        list of list of int: The transformed board.
+    """
+    rows, cols, digits, transpose = transform
+    result = [[digits[board[row][col]] for col in cols] for row in rows]
+    if transpose:
+        result = [list(line) for line in zip(*result)]
+    return result
+
+
+def transformed_puzzle(difficulty, rng=random, path=None):
+    """
+    Derive a puzzle from a random seed of the given difficulty.
+    Args:
+        difficulty (str): The difficulty.
+        rng (random.Random): The random number generator.
+        path (str, optional): The seed bank file.
+    Returns:
+        tuple: (board, solution), or None if the bank has no seed of that difficulty.
+    """
+    seeds = load_seed_bank(path).get(difficulty)
+    if not seeds:
+        return None
+    board, solution = rng.choice(seeds)
+    transform = random_transform(rng)
+    return apply_transform(board, transform), apply_transform(solution, transform)
+
+
+def main():
+    # 延迟导入：sudoku_generator 本身依赖这个模块
+    from sudoku_generator import generate_with_clues, DIFFICULTY_RANGES
+    from sudoku_solver import has_unique_solution
+
+    parser = argparse.ArgumentParser(description="Build the seed bank used by the 'transform' generator mode")
+    parser.add_argument('-o', '--output', default=SEED_BANK_PATH)
+    parser.add_argument('--count', type=int, default=30, help="seeds per difficulty")
+    parser.add_argument('--seed', type=int, default=2025)
+    parser.add_argument('--max-checks', type=int, default=20000, help="uniqueness checks per seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with open(args.output, 'w') as f:
+        f.write("# difficulty puzzle solution\n")
+        for difficulty, (min_numbers, max_numbers) in DIFFICULTY_RANGES.items():
+            written = 0
+            while written < args.count:
+                # 提示数在难度范围内轮流取值，每个提示数的种子数量相同，
+                # 变换得到的谜题才能覆盖整个范围（挖洞生成很少得到范围下限的谜题）
+                target = min_numbers + written % (max_numbers - min_numbers + 1)
+                stats = {}
+                board, solution = generate_with_clues(target, max_checks=args.max_checks, stats=stats, rng=rng)
+                # 只收录达到目标提示数、并经完整的两解搜索确认唯一解的谜题
+                if not stats['reached'] or not has_unique_solution(board, use_cache=False):
+                    continue
+                written += 1
+                key = board_to_string(board).replace('/', '')
+                f.write(f"{difficulty} {key} {board_to_string(solution).replace('/', '')}\n")
+
+
+if __name__ == '__main__':
+    main()
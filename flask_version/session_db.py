@@ -0,0 +1,481 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+SQLite persistence for the session store with write-behind batching.
+
+The database keeps a log of changes per session instead of whole boards, so edits that different
+gunicorn workers make to the same session at the same time are merged instead of overwriting each
+other. An edit is stored as a delta: for every cell it touched, the new cell value and the draft
+bits it set and cleared. Starting a new puzzle is stored as a reset holding the whole board.
+Loading a session applies its changes in version order (versions are time.time_ns() of the
+change) on top of its snapshot; a reset discards every change older than itself.
+
+Changes are only recorded in memory when a request makes them; a background thread writes them to
+the database in one transaction every flush_interval seconds, or as soon as flush_size changes are
+waiting. The database uses WAL mode so all gunicorn workers on the host can read and write the same
+file concurrently. Every change gets an increasing sequence number when it is committed, and the
+same thread periodically folds changes older than _COMPACT_AGE seconds into the session's snapshot.
+
+After each flush the same thread checks PRAGMA data_version, which only changes when another
+connection (another worker) has committed. Only then does it read which sessions other workers
+changed since the last poll, so the session store can tell with a dict lookup whether its copy of
+a session is stale, without a query per request.
+"""
+
+import os
+import secrets
+import sqlite3
+import struct
+import threading
+import time
+
+from functions import ALL_DIGITS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_snapshots (
+    sid TEXT PRIMARY KEY,
+    cells BLOB NOT NULL,
+    drafts BLOB NOT NULL,
+    initial BLOB NOT NULL,
+    seq INTEGER NOT NULL,
+    reset_version INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS session_snapshots_updated ON session_snapshots (updated);
+CREATE TABLE IF NOT EXISTS session_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    sid TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    writer TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    data BLOB NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS session_changes_sid ON session_changes (sid, seq);
+"""
+
+# 81 个 9 位草稿掩码共 729 位，81 位初始格掩码
+_DRAFT_BYTES = 92
+_INITIAL_BYTES = 11
+
+# 增量中的一项：格子下标、新的格子值（ASCII 数字，0 表示没有变化）、新增和清除的草稿位
+_DELTA = struct.Struct('<BBHH')
+
+# 清理过期会话和合并变更的最小间隔（秒）
+_PURGE_INTERVAL = 60
+
+# 早于这个秒数的变更合并进快照；其他 worker 写入队列中的等待和重试都远短于它
+_COMPACT_AGE = 30
+
+
+def pack_board(board):
+    """
+    Serialize a CompactBoard.
+    Returns:
+        tuple: (cells, drafts, initial) as bytes.
+    """
+    return (bytes(board.cells),
+            board.drafts.to_bytes(_DRAFT_BYTES, 'little'),
+            board.initial_mask.to_bytes(_INITIAL_BYTES, 'little'))
+
+
+def unpack_board(board, cells, drafts, initial):
+    """
+    Load serialized state into a CompactBoard.
+    """
+    board.cells = bytearray(cells)
+    board.drafts = int.from_bytes(drafts, 'little')
+    board.initial_mask = int.from_bytes(initial, 'little')
+    return board
+
+
+def board_state(board):
+    """
+    Copy the state of a CompactBoard, to compute a delta against it later.
+    Returns:
+        tuple: (cells, drafts, initial_mask)
+    """
+    return bytes(board.cells), board.drafts, board.initial_mask
+
+
+def board_delta(before, board):
+    """
+    Describe how a board changed since board_state() was taken.
+    Args:
+        before (tuple): The result of board_state().
+        board (CompactBoard): The board now.
+    Returns:
+        bytes: The delta; empty if nothing changed, None if the initial cells changed (store the
+               whole board instead).
+    """
+    cells, drafts, initial = before
+    if board.initial_mask != initial:
+        return None
+    changed_drafts = board.drafts ^ drafts
+    if not changed_drafts and board.cells == cells:
+        return b''
+    delta = bytearray()
+    for cell in range(81):
+        value = board.cells[cell]
+        diff = (changed_drafts >> (cell * 9)) & ALL_DIGITS
+        if diff or value != cells[cell]:
+            new = (board.drafts >> (cell * 9)) & ALL_DIGITS
+            delta += _DELTA.pack(cell, value if value != cells[cell] else 0, new & diff, ~new & diff)
+    return bytes(delta)
+
+
+def _apply_delta(cells, drafts, delta):
+    # 合并其他 worker 的修改：草稿位逐位新增或清除，填了数字的格子不保留草稿
+    for cell, value, added, cleared in _DELTA.iter_unpack(delta):
+        shift = cell * 9
+        if value:
+            cells[cell] = value
+        drafts = (drafts & ~(cleared << shift)) | (added << shift)
+        if cells[cell] != 48:
+            drafts &= ~(ALL_DIGITS << shift)
+    return drafts
+
+
+def _merge(snapshot, changes):
+    """
+    Apply changes to a session snapshot.
+    Args:
+        snapshot (tuple): (cells, drafts, initial, seq, reset_version) from session_snapshots, or None.
+        changes (iterable): (seq, version, kind, data); seq is None for changes not yet written.
+    Returns:
+        tuple: (cells, drafts, initial, seq, reset_version) with drafts and initial as ints and seq
+               the largest sequence number applied.
+    """
+    if snapshot is None:
+        cells, drafts, initial, seq, reset_version = bytearray(b"0" * 81), 0, 0, 0, 0
+    else:
+        cells, drafts, initial, seq, reset_version = snapshot
+        cells = bytearray(cells)
+        drafts = int.from_bytes(drafts, 'little')
+        initial = int.from_bytes(initial, 'little')
+    for change_seq, version, kind, data in sorted(changes, key=lambda change: change[1]):
+        if change_seq is not None:
+            seq = max(seq, change_seq)
+        # 比最近一次重置更早的修改属于之前的谜题，丢弃
+        if version < reset_version:
+            continue
+        if kind == 'reset':
+            cells = bytearray(data[:81])
+            drafts = int.from_bytes(data[81:81 + _DRAFT_BYTES], 'little')
+            initial = int.from_bytes(data[81 + _DRAFT_BYTES:], 'little')
+            reset_version = version
+        else:
+            drafts = _apply_delta(cells, drafts, data)
+    return cells, drafts, initial, seq, reset_version
+
+
+class SQLiteSessionBackend:
+    """
+    Write-behind SQLite storage for session boards.
+    Attributes:
+        path (str): The database file.
+        flush_interval (float): Seconds between background flushes.
+        flush_size (int): Number of pending changes that triggers an early flush.
+        ttl (float): Sessions not changed for this many seconds are deleted; None keeps them.
+        flushes, rows_written, loads, polls, compactions, errors (int): Counters since creation.
+    """
+
+    def __init__(self, path, flush_interval=1.0, flush_size=256, ttl=None):
+        """
+        Initialize the backend and create the tables if needed.
+        Args:
+            path (str): The database file.
+            flush_interval (float): Seconds between flushes.
+            flush_size (int): Pending changes that trigger an early flush.
+            ttl (float, optional): Seconds after which idle sessions are deleted.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.ttl = ttl
+        self.flushes = 0
+        self.rows_written = 0
+        self.loads = 0
+        self.polls = 0
+        self.compactions = 0
+        self.errors = 0
+        self._pending = []  # (sid, version, kind, data, updated)，按修改顺序
+        self._seen = {}  # sid -> (seq, 记录时间)，flush 线程看到的其他 worker 最新的变更
+        self._data_version = None
+        self._poll_seq = 0
+        self._pid = None
+        self._writer = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._local = threading.local()
+        self._last_purge = 0.0
+        # 建表使用临时连接，避免预加载的主进程把打开的连接带进 fork 出的 worker
+        conn = sqlite3.connect(path, timeout=5.0)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        # 每个线程使用自己的连接；WAL 模式下读写互不阻塞
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _writer_id(self):
+        # 区分本进程和其他 worker 写入的变更；预加载时创建的后端在 fork 之后换一个新的编号
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._writer = secrets.token_hex(8)
+        return self._writer
+
+    def start(self):
+        """
+        Start the background flush thread.
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='session-flush', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stop the flush thread and write everything still pending.
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _queue(self, sid, version, kind, data):
+        with self._lock:
+            self._pending.append((sid, version, kind, data, time.time()))
+            full = len(self._pending) >= self.flush_size
+        if full:
+            self._wake.set()
+
+    def save(self, sid, board, version):
+        """
+        Queue a reset: the whole board replaces the session, discarding all older changes.
+        Args:
+            sid (str): The session id.
+            board (CompactBoard): The session's board; it is copied, so it may change afterwards.
+            version (int): Version of this state.
+        """
+        self._queue(sid, version, 'reset', b''.join(pack_board(board)))
+
+    def save_delta(self, sid, delta, version):
+        """
+        Queue an edit of a session.
+        Args:
+            sid (str): The session id.
+            delta (bytes): The change, from board_delta().
+            version (int): Version of this change; changes are applied in version order.
+        """
+        self._queue(sid, version, 'edit', delta)
+
+    def load(self, sid):
+        """
+        Read a session: its snapshot with all written and pending changes applied.
+        Args:
+            sid (str): The session id.
+        Returns:
+            tuple: (cells, drafts, initial, seq), or None if the session is unknown. seq is the
+                   largest sequence number of the changes read from the database (0 if none).
+        """
+        with self._lock:
+            pending = [(None, version, kind, data) for key, version, kind, data, _ in self._pending if key == sid]
+        self.loads += 1
+        conn = self._connect()
+        # 快照和变更在同一个读事务中读取，中间不会被合并
+        conn.execute("BEGIN")
+        try:
+            snapshot = conn.execute(
+                "SELECT cells, drafts, initial, seq, reset_version FROM session_snapshots WHERE sid = ?",
+                (sid,)).fetchone()
+            changes = conn.execute(
+                "SELECT seq, version, kind, data FROM session_changes WHERE sid = ? AND seq > ?",
+                (sid, snapshot[3] if snapshot else 0)).fetchall()
+        finally:
+            conn.commit()
+        if snapshot is None and not changes and not pending:
+            return None
+        cells, drafts, initial, seq, _ = _merge(snapshot, changes + pending)
+        return (bytes(cells), drafts.to_bytes(_DRAFT_BYTES, 'little'),
+                initial.to_bytes(_INITIAL_BYTES, 'little'), seq)
+
+    def has_newer(self, sid, seq):
+        """
+        Check without a query whether another worker has written a change of a session after
+        the given sequence number, as far as the flush thread has seen.
+        """
+        with self._lock:
+            seen = self._seen.get(sid)
+        return seen is not None and seen[0] > seq
+
+    def poll(self):
+        """
+        Record which sessions other connections changed since the last poll.
+        Returns:
+            int: Number of sessions changed by other workers; 0 if nobody else committed.
+        """
+        conn = self._connect()
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return 0
+        self._data_version = data_version
+        rows = conn.execute(
+            "SELECT sid, MAX(CASE WHEN writer != ? THEN seq END), MAX(seq) FROM session_changes "
+            "WHERE seq > ? GROUP BY sid", (self._writer_id(), self._poll_seq)).fetchall()
+        self.polls += 1
+        now = time.time()
+        changed = 0
+        with self._lock:
+            for sid, other_seq, max_seq in rows:
+                self._poll_seq = max(self._poll_seq, max_seq)
+                if other_seq is not None:
+                    self._seen[sid] = (other_seq, now)
+                    changed += 1
+        return changed
+
+    def flush(self):
+        """
+        Write all pending changes in one transaction.
+        Returns:
+            int: Number of changes written.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        writer = self._writer_id()
+        rows = [(sid, version, writer, kind, data, updated) for sid, version, kind, data, updated in pending]
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT INTO session_changes (sid, version, writer, kind, data, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error:
+            # 写入失败时放回队列，排在期间的新修改之前，下次重试
+            self.errors += 1
+            with self._lock:
+                self._pending = pending + self._pending
+            return 0
+        self.flushes += 1
+        self.rows_written += len(rows)
+        return len(rows)
+
+    def compact(self, age=_COMPACT_AGE):
+        """
+        Fold changes older than age seconds into the snapshots of their sessions.
+        Changes are folded in sequence order up to the first newer one, so every change that is
+        not folded has a larger sequence number than the snapshot.
+        Returns:
+            int: Number of sessions compacted.
+        """
+        horizon = time.time_ns() - int(age * 1e9)
+        conn = self._connect()
+        # 写事务从一开始就持有写锁，其他 worker 的合并和写入在此期间等待
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            sids = [row[0] for row in conn.execute(
+                "SELECT DISTINCT sid FROM session_changes WHERE version < ?", (horizon,))]
+            compacted = 0
+            for sid in sids:
+                changes = []
+                updated = 0.0
+                for seq, version, kind, data, changed in conn.execute(
+                        "SELECT seq, version, kind, data, updated FROM session_changes WHERE sid = ? ORDER BY seq",
+                        (sid,)):
+                    if version >= horizon:
+                        break
+                    changes.append((seq, version, kind, data))
+                    updated = max(updated, changed)
+                if not changes:
+                    continue
+                snapshot = conn.execute(
+                    "SELECT cells, drafts, initial, seq, reset_version, updated FROM session_snapshots WHERE sid = ?",
+                    (sid,)).fetchone()
+                cells, drafts, initial, seq, reset_version = _merge(snapshot[:5] if snapshot else None, changes)
+                conn.execute(
+                    "INSERT OR REPLACE INTO session_snapshots (sid, cells, drafts, initial, seq, reset_version, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (sid, bytes(cells), drafts.to_bytes(_DRAFT_BYTES, 'little'),
+                     initial.to_bytes(_INITIAL_BYTES, 'little'), seq, reset_version,
+                     max(updated, snapshot[5]) if snapshot else updated))
+                conn.execute("DELETE FROM session_changes WHERE sid = ? AND seq <= ?", (sid, seq))
+                compacted += 1
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        self.compactions += compacted
+        return compacted
+
+    def purge(self):
+        """
+        Delete sessions not changed within ttl seconds.
+        """
+        if not self.ttl:
+            return
+        cutoff = time.time() - self.ttl
+        with self._connect() as conn:
+            conn.execute("DELETE FROM session_changes WHERE sid IN "
+                         "(SELECT sid FROM session_changes GROUP BY sid HAVING MAX(updated) < ?)", (cutoff,))
+            # 还有较新变更的会话保留快照
+            conn.execute("DELETE FROM session_snapshots WHERE updated < ? "
+                         "AND sid NOT IN (SELECT sid FROM session_changes)", (cutoff,))
+        with self._lock:
+            # 过期会话的记录也不再需要
+            self._seen = {sid: seen for sid, seen in self._seen.items() if seen[1] >= cutoff}
+        self._last_purge = time.monotonic()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            try:
+                self.poll()
+            except sqlite3.Error:
+                self.errors += 1
+            if time.monotonic() - self._last_purge > _PURGE_INTERVAL:
+                try:
+                    self.compact()
+                    self.purge()
+                except sqlite3.Error:
+                    self.errors += 1
+                self._last_purge = time.monotonic()
+
+    def stats(self):
+        """
+        Get the backend counters.
+        Returns:
+            dict: path, pending, flush_interval, flush_size, flushes, rows_written, loads, polls,
+                  compactions and errors.
+        """
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'path': self.path,
+            'pending': pending,
+            'flush_interval': self.flush_interval,
+            'flush_size': self.flush_size,
+            'flushes': self.flushes,
+            'rows_written': self.rows_written,
+            'loads': self.loads,
+            'polls': self.polls,
+            'compactions': self.compactions,
+            'errors': self.errors,
+        }
@@ -0,0 +1,241 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Per-session board and draft store for the draft endpoints.
+
+Every player gets a CompactBoard keyed by a session id. The store holds at most max_sessions
+boards and, if max_bytes is set, at most max_bytes bytes of boards as estimated by board_size().
+Beyond either limit it evicts the least recently used sessions. Sessions idle for longer than ttl
+seconds are dropped, so memory use stays bounded no matter how many players connect.
+
+With a persistence backend (see session_db.py) every edit is also queued for a write-behind
+flush as a delta of the cells and drafts it changed, sessions missing from memory are read back
+from the database, and a session is reloaded if the backend's flush thread has seen another worker
+write a change of it. Because only deltas are written, requests of one player that different
+workers handle within the same flush interval are merged rather than overwriting each other.
+Checking for changes is a dict lookup; the database is only read on a miss or an actual change,
+and never while the store-wide lock is held, so requests of other sessions do not wait for the disk.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import secrets
+import sys
+import threading
+import time
+import zlib
+
+from functions import CompactBoard
+from session_db import board_delta, board_state, unpack_board
+
+# 按会话加锁时使用的锁的数量；同一个会话的请求依次执行，不同会话大多互不等待
+_SESSION_LOCKS = 64
+
+
+def new_session_id():
+    """
+    Create a random session id.
+    Returns:
+        str: 22 URL-safe characters.
+    """
+    return secrets.token_urlsafe(16)
+
+
+def board_size(board):
+    """
+    Estimate the memory used by a CompactBoard in bytes.
+    """
+    return (sys.getsizeof(board) + sys.getsizeof(board.cells)
+            + sys.getsizeof(board.drafts) + sys.getsizeof(board.initial_mask))
+
+
+class SessionStore:
+    """
+    A thread-safe LRU/TTL store of CompactBoards keyed by session id.
+    Attributes:
+        max_sessions (int): Maximum number of sessions kept in memory.
+        max_bytes (int): Maximum estimated memory of the boards kept in memory; None for no limit.
+        ttl (float): Seconds a session may stay idle; None keeps sessions until they are evicted.
+        backend (SQLiteSessionBackend): Optional persistence backend.
+        created, hits, restored, reloaded, evictions, expirations (int): Counters since creation.
+    """
+
+    def __init__(self, max_sessions=10000, ttl=None, backend=None, max_bytes=None):
+        """
+        Initialize the store.
+        Args:
+            max_sessions (int): Maximum number of sessions.
+            ttl (float, optional): Idle seconds before a session expires.
+            backend (SQLiteSessionBackend, optional): Persistence backend.
+            max_bytes (int, optional): Maximum bytes of boards, see board_size().
+        """
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.backend = backend
+        self.created = 0
+        self.hits = 0
+        self.restored = 0
+        self.reloaded = 0
+        self.evictions = 0
+        self.expirations = 0
+        # session id -> (board, last access, 已读到的数据库变更序号, board_size)
+        self._sessions = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._session_locks = [threading.Lock() for _ in range(_SESSION_LOCKS)]
+
+    def _session_lock(self, sid):
+        return self._session_locks[zlib.crc32(sid.encode()) % _SESSION_LOCKS]
+
+    def _expire(self, now):
+        # 按最近使用顺序排列，从最旧的开始清理过期会话
+        while self._sessions and self.ttl:
+            sid, entry = next(iter(self._sessions.items()))
+            if now - entry[1] <= self.ttl:
+                break
+            del self._sessions[sid]
+            self._bytes -= entry[3]
+            self.expirations += 1
+
+    def _load(self, sid):
+        """
+        Get the board of a session, creating an empty one if the session is unknown.
+        Must be called with the session's lock held and the store-wide lock not held.
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._sessions.get(sid)
+            if entry is not None:
+                board, _, seq, _ = entry
+                # 只有后端看到其他 worker 写入了新的变更时才需要读数据库
+                if self.backend is None or not self.backend.has_newer(sid, seq):
+                    self.hits += 1
+                    self._store(sid, board, seq)
+                    return board
+
+        # 读数据库时只持有这个会话的锁
+        state = self.backend.load(sid) if self.backend is not None else None
+
+        with self._lock:
+            if entry is not None:
+                self.hits += 1
+                seq = entry[2]
+                if state is not None:
+                    unpack_board(board, *state[:3])
+                    seq = state[3]
+                    self.reloaded += 1
+            elif state is not None:
+                board = unpack_board(CompactBoard(), *state[:3])
+                seq = state[3]
+                self.restored += 1
+            else:
+                board = CompactBoard()
+                seq = 0
+                self.created += 1
+            self._store(sid, board, seq)
+        return board
+
+    def _store(self, sid, board, seq):
+        old = self._sessions.get(sid)
+        if old is not None:
+            self._bytes -= old[3]
+        size = board_size(board)
+        self._sessions[sid] = (board, time.monotonic(), seq, size)
+        self._sessions.move_to_end(sid)
+        self._bytes += size
+        # 刚使用的会话总是保留，即使它本身超过了字节数上限
+        while len(self._sessions) > 1 and (len(self._sessions) > self.max_sessions
+                                           or (self.max_bytes and self._bytes > self.max_bytes)):
+            # 被淘汰的会话如有未写入的修改，仍在后端的写入队列中
+            _, evicted = self._sessions.popitem(last=False)
+            self._bytes -= evicted[3]
+            self.evictions += 1
+
+    def _changed(self, sid, board, before):
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if entry is not None and entry[0] is board:
+                # 草稿增减会改变棋盘占用的内存
+                self._store(sid, board, entry[2])
+        # 本地修改不改变已读到的变更序号；只把改动的部分排入后端的批量写入
+        if self.backend is None:
+            return
+        delta = board_delta(before, board)
+        if delta is None:
+            self.backend.save(sid, board, time.time_ns())
+        elif delta:
+            self.backend.save_delta(sid, delta, time.time_ns())
+
+    @contextmanager
+    def edit(self, sid):
+        """
+        Lock a session and yield its board, creating it if needed.
+        Args:
+            sid (str): The session id.
+        Yields:
+            CompactBoard: The session's board; changes made inside the block are kept.
+        """
+        with self._session_lock(sid):
+            board = self._load(sid)
+            before = board_state(board)
+            yield board
+            self._changed(sid, board, before)
+
+    def reset(self, sid, board):
+        """
+        Replace the board of a session, e.g. when the player starts a new puzzle.
+        Args:
+            sid (str): The session id.
+            board (list of list of int): The new puzzle; its numbers are marked as initial cells
+                and all drafts are cleared.
+        """
+        compact = CompactBoard(board)
+        for row in range(9):
+            for col in range(9):
+                if board[row][col]:
+                    compact.set_initial_cell(row, col)
+        with self._session_lock(sid):
+            with self._lock:
+                entry = self._sessions.get(sid)
+                self._store(sid, compact, entry[2] if entry is not None else 0)
+            # 重置写入整个棋盘，版本更早的修改（包括其他 worker 尚未写入的）不再生效
+            if self.backend is not None:
+                self.backend.save(sid, compact, time.time_ns())
+
+    def discard(self, sid):
+        """
+        Remove a session.
+        """
+        with self._lock:
+            entry = self._sessions.pop(sid, None)
+            if entry is not None:
+                self._bytes -= entry[3]
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self):
+        """
+        Get the store's occupancy and counters.
+        Returns:
+            dict: sessions, max_sessions, max_bytes, ttl, memory_bytes, created, hits, restored, reloaded,
+                  evictions, expirations and the backend's counters under 'backend' (None without a backend).
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                'sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'memory_bytes': self._bytes,
+                'created': self.created,
+                'hits': self.hits,
+                'restored': self.restored,
+                'reloaded': self.reloaded,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'backend': self.backend.stats() if self.backend is not None else None,
+            }
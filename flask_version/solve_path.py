@@ -0,0 +1,122 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Solve paths recorded once per generated puzzle, so hints for it are a lookup instead of a search.
+
+A path is the ordered list of hints analyze_hint gives when a puzzle is solved step by step from
+its clues. A player's board can be answered from the path if it holds the clues and every other
+number agrees with the solution: the first step whose cell is still empty is then a valid hint,
+because everything that step relies on is already on the board or follows from it. Steps where
+logic gets stuck are not stored; hints for them, and for boards that do not match, still go
+through the normal search.
+"""
+
+from functions import Board
+from techniques import logical_hint
+from result_cache import LRUCache
+from wire import encode_string
+from metrics import metrics
+
+
+def record_solve_path(board, solution):
+    """
+    Solve a puzzle step by step with the logic of analyze_hint.
+    Args:
+        board (list of list of int): The puzzle; it is not modified.
+        solution (list of list of int): Its unique solution.
+    Returns:
+        tuple: Steps (row, col, analysis) in solving order. analysis has the form analyze_hint
+               returns, or is None where logic got stuck and the solution was filled in.
+    """
+    # 同一个 Board 一路填下去，数字掩码和候选数索引随每一步增量更新；
+    # 推理技巧的候选数网格仍然每一步重新生成，因为删减候选数的结论只对当时的局面成立
+    grid = Board([line[:] for line in board])
+    steps = []
+    while True:
+        deduction = logical_hint(grid.board, grid)
+        if deduction is None:
+            # 逻辑推理无法继续时，在候选数最少的格子填入解中的数字后继续
+            constraint, cells = grid.most_constrained_cells()
+            if not cells:
+                return tuple(steps)
+            row, col = cells[0]
+            steps.append((row, col, None))
+        else:
+            row, col = deduction['row'], deduction['col']
+            steps.append((row, col, ((row, col, (deduction['number'],), deduction['technique'],
+                                      tuple(deduction['cells'])),)))
+        grid.place(row, col, solution[row][col])
+
+
+def with_solve_path(generate, *args):
+    """
+    Call a puzzle generator and record the solve path of its puzzle; meant to run in a solver
+    worker process, e.g. with generate_sudoku or generate_from_id.
+    Returns:
+        tuple: (board, solution, path)
+    """
+    board, solution = generate(*args)
+    return board, solution, record_solve_path(board, solution)
+
+
+class SolvePathStore:
+    """
+    Solve paths by puzzle ID, with the same size and age limits as the result caches.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        """
+        Initialize the store.
+        Args:
+            maxsize (int): Maximum number of puzzles kept.
+            ttl (float, optional): Seconds a path is kept after it was last stored.
+        """
+        self._paths = LRUCache(maxsize, ttl)
+
+    def put(self, puzzle_id, board, solution, path):
+        """
+        Store the path of a puzzle.
+        """
+        self._paths.put(puzzle_id, (encode_string(board), encode_string(solution), path))
+
+    def match(self, puzzle_id, board):
+        """
+        Answer a hint request from the stored path.
+        Args:
+            puzzle_id (str): The puzzle the board belongs to.
+            board (list of list of int): The player's board.
+        Returns:
+            tuple or str: The analysis for get_next_hint, or None if the hint needs a search.
+        """
+        entry = self._paths.get(puzzle_id)
+        if entry is None:
+            metrics.inc('sudoku_solve_path_lookups_total', result='miss')
+            return None
+        clues, solution, path = entry
+        current = encode_string(board)
+        # 初始数字必须都在，其余填入的数字必须与解一致
+        for clue, num, answer in zip(clues, current, solution):
+            if (clue != '0' and num != clue) or (num != '0' and num != answer):
+                metrics.inc('sudoku_solve_path_lookups_total', result='mismatch')
+                return None
+        for row, col, analysis in path:
+            if current[row * 9 + col] == '0':
+                if analysis is None:
+                    break
+                metrics.inc('sudoku_solve_path_lookups_total', result='hit')
+                return analysis
+        else:
+            metrics.inc('sudoku_solve_path_lookups_total', result='hit')
+            return "数独已完成！"
+        metrics.inc('sudoku_solve_path_lookups_total', result='search')
+        return None
+
+    def __contains__(self, puzzle_id):
+        return puzzle_id in self._paths
+
+    def stats(self):
+        """
+        Get the store counters, as LRUCache.stats().
+        """
+        return self._paths.stats()
@@ -0,0 +1,323 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Sudoku puzzle generation: fill a complete grid, then dig holes while keeping a unique solution,
+or transform a vetted puzzle from the seed bank (see seed_bank.py).
+
+generate_sudoku digs in one random order and stops when it has tried every cell, so it may end
+above the requested number of clues. generate_with_clues keeps going from such a dead end: it
+puts a few removed clues back, digs again in a new order and keeps the result unless it has more
+clues, switching to a new complete grid when that stops helping. A budget of uniqueness checks
+bounds the work; if it runs out, the puzzle with the fewest clues found so far is returned and
+the caller can see the clues achieved in stats.
+"""
+
+from functions import Board
+from sudoku_solver import has_unique_solution, has_completion
+from metrics import metrics
+from seed_bank import transformed_puzzle
+import random
+import copy
+import os
+import time
+
+# 根据难度设置保留的数字数量范围。挖洞生成很少停在 23 以下，hard 的下限部分（20-22）只在
+# generate_with_clues 的检查次数内尽量达到，达不到时取找到的最接近的结果（仍在范围内）
+DIFFICULTY_RANGES = {
+    'easy': (35, 40),
+    'medium': (25, 30),
+    'hard': (20, 25)
+}
+
+# 挖洞时的唯一性检查方式:
+#   'incremental' —— 利用已知解，只检查被挖格子能否填入其他数字（在同一个棋盘上原地搜索）
+#   'full'        —— 每次挖洞后对整个棋盘重新做两解搜索
+#   'transform'   —— 不挖洞，对种子库中同难度的谜题做随机的等价变换（常数时间，唯一解有保证）
+#   'targeted'    —— 在难度范围内随机选定提示数，用 generate_with_clues 回溯挖洞达到它（检查次数用完时取最接近的结果）
+DEFAULT_GENERATOR_MODE = os.environ.get('SUDOKU_GENERATOR_MODE', 'incremental')
+
+# generate_with_clues 最多做多少次唯一性检查，以及 'targeted' 模式默认使用的对称方式
+DEFAULT_MAX_CHECKS = int(os.environ.get('SUDOKU_GENERATOR_MAX_CHECKS', 1000))
+DEFAULT_SYMMETRY = os.environ.get('SUDOKU_GENERATOR_SYMMETRY', 'none')
+
+# 对称方式：格子 -> 必须和它一起挖空的格子
+SYMMETRIES = {
+    'none': lambda row, col: ((row, col),),
+    'central': lambda row, col: ((row, col), (8 - row, 8 - col)),   # 中心对称（旋转 180 度）
+    'mirror': lambda row, col: ((row, col), (row, 8 - col)),        # 左右对称
+    'diagonal': lambda row, col: ((row, col), (col, row)),          # 主对角线对称
+}
+
+# 有唯一解的数独至少需要 17 个提示数
+MIN_CLUES = 17
+
+# generate_with_clues 每次最多放回几组，以及同一个完整解上连续多少次没有改进后换一个完整解
+MAX_UNDO = int(os.environ.get('SUDOKU_GENERATOR_MAX_UNDO', 2))
+MAX_STALE = int(os.environ.get('SUDOKU_GENERATOR_MAX_STALE', 40))
+
+def has_alternative(grid, row, col, value, stats=None):
+    """
+    判断空格 (row, col) 是否存在一个填入 value 以外数字的完整解。
+    如果挖洞前的棋盘有唯一解且该格在解中为 value，则返回 False 等价于挖洞后仍有唯一解。
+    Args:
+        grid: Board 对象，原地搜索后恢复原状
+        row, col: 刚被挖空的格子
+        value: 该格在已知解中的数字
+        stats (dict, optional): 搜索节点数累加到 stats['nodes']
+    Returns:
+        bool: 是否存在其他解
+    """
+    for num in grid.candidate_list(row, col):
+        if num == value:
+            continue
+        grid.place(row, col, num)
+        found = has_completion(grid, stats)
+        grid.clear(row, col)
+        if found:
+            return True
+    return False
+
+def _fill_grid(grid, rng, counts):
+    """
+    用随机顺序的回溯把空的 Board 填成一个完整的有效数独
+    """
+    empty = grid.find_empty()
+    if not empty:
+        return True
+
+    row, col = empty
+    nums = list(grid.candidate_list(row, col))
+    rng.shuffle(nums)  # 随机打乱数字顺序
+
+    for num in nums:
+        counts['fill_attempts'] += 1
+        grid.place(row, col, num)
+        if _fill_grid(grid, rng, counts):
+            return True
+        grid.clear(row, col)
+    return False
+
+def symmetry_groups(symmetry='none'):
+    """
+    把 81 个格子按对称方式分组，同一组的格子一起挖空
+    Args:
+        symmetry: SYMMETRIES 中的名称
+    Returns:
+        list: 每组为格子坐标的元组，按行优先顺序排列
+    """
+    if symmetry not in SYMMETRIES:
+        raise ValueError(f"Unknown symmetry: {symmetry}")
+    groups = {tuple(sorted(set(SYMMETRIES[symmetry](row, col)))) for row in range(9) for col in range(9)}
+    return sorted(groups)
+
+def _dig(grid, solution, candidates, filled, clues, counts, max_checks):
+    """
+    按 candidates 的顺序逐组挖空，保持唯一解，提示数不低于 clues
+    Returns:
+        tuple: (挖空的组列表, 剩余提示数)
+    """
+    removed = []
+    for group in candidates:
+        if filled == clues or counts['uniqueness_checks'] >= max_checks:
+            break
+        if filled - len(group) < clues:
+            continue
+        for row, col in group:
+            grid.clear(row, col)
+        counts['uniqueness_checks'] += 1
+        # 挖洞前有唯一解，所以新的解必然在刚挖空的某个格子上与已知解不同
+        if any(has_alternative(grid, row, col, solution[row][col], counts) for row, col in group):
+            for row, col in group:
+                grid.place(row, col, solution[row][col])
+            counts['removals_rejected'] += 1
+        else:
+            removed.append(group)
+            filled -= len(group)
+    return removed, filled
+
+def generate_with_clues(clues, symmetry='none', max_checks=None, stats=None, rng=None):
+    """
+    生成一个有唯一解、恰好保留 clues 个数字的数独。
+    按随机顺序挖洞直到无法再挖；提示数仍多于目标时，随机放回最多 MAX_UNDO 组，换一个顺序重新挖，
+    结果不比之前差时保留。同一个完整解连续 MAX_STALE 次没有改进时换一个新的完整解。
+    检查次数用完仍未达到目标时，返回找到的提示数最少的谜题（仍有唯一解）。
+    Args:
+        clues: 目标提示数（17 到 81）
+        symmetry: 挖洞的对称方式，见 SYMMETRIES；对称时目标的奇偶性可能无法达到，此时取最接近的结果
+        max_checks: 唯一性检查次数上限，默认为 DEFAULT_MAX_CHECKS
+        stats (dict, optional): 如果提供，写入 clues（实际提示数）、target（目标）、reached（是否达到），
+            并累加 grids（使用的完整解个数）、uniqueness_checks、nodes、fill_attempts、removals_rejected、
+            backtracks（放回的组数）和 seconds
+        rng (random.Random, optional): 随机数生成器，默认使用 random 模块
+    Returns:
+        tuple: (board, solution)
+    """
+    if not MIN_CLUES <= clues <= 81:
+        raise ValueError(f"The number of clues must be between {MIN_CLUES} and 81.")
+    groups = symmetry_groups(symmetry)
+    max_checks = DEFAULT_MAX_CHECKS if max_checks is None else max_checks
+    rng = rng or random
+    counts = {'grids': 0, 'uniqueness_checks': 0, 'nodes': 0, 'fill_attempts': 0,
+              'removals_rejected': 0, 'backtracks': 0}
+    best = None  # (提示数, board, solution)
+    start = time.perf_counter()
+
+    while best is None or (best[0] > clues and counts['uniqueness_checks'] < max_checks):
+        grid = Board([[0] * 9 for _ in range(9)])
+        _fill_grid(grid, rng, counts)
+        counts['grids'] += 1
+        solution = copy.deepcopy(grid.board)
+        order = list(groups)
+        rng.shuffle(order)
+        path, filled = _dig(grid, solution, order, 81, clues, counts, max_checks)
+        stale = 0
+        while True:
+            if best is None or filled < best[0]:
+                best = (filled, copy.deepcopy(grid.board), solution)
+            if filled == clues or stale >= MAX_STALE or counts['uniqueness_checks'] >= max_checks or not path:
+                break
+            # 随机放回几组已挖空的格子，在所有未挖空的组上换一个顺序重新挖
+            undone = rng.sample(path, rng.randint(1, min(len(path), MAX_UNDO)))
+            path = [group for group in path if group not in undone]
+            for group in undone:
+                for row, col in group:
+                    grid.place(row, col, solution[row][col])
+            counts['backtracks'] += len(undone)
+            order = [group for group in groups if grid.board[group[0][0]][group[0][1]]]
+            rng.shuffle(order)
+            more, refilled = _dig(grid, solution, order, filled + sum(map(len, undone)), clues, counts, max_checks)
+            if refilled <= filled:
+                stale = stale + 1 if refilled == filled else 0
+                path += more
+                filled = refilled
+            else:
+                # 结果更差，恢复到放回之前的谜题（它有唯一解，不需要再检查）
+                for group in more:
+                    for row, col in group:
+                        grid.place(row, col, solution[row][col])
+                for group in undone:
+                    for row, col in group:
+                        grid.clear(row, col)
+                path += undone
+                stale += 1
+
+    filled, board, solution = best
+    seconds = time.perf_counter() - start
+    metrics.inc('sudoku_generator_fill_attempts_total', counts['fill_attempts'])
+    metrics.inc('sudoku_generator_removals_tried_total', counts['uniqueness_checks'])
+    metrics.inc('sudoku_generator_removals_rejected_total', counts['removals_rejected'])
+    metrics.inc('sudoku_generator_nodes_total', counts['nodes'])
+    metrics.observe('sudoku_generator_phase_seconds', seconds, phase='targeted')
+    if filled != clues:
+        metrics.inc('sudoku_generator_target_missed_total')
+    if stats is not None:
+        counts['seconds'] = seconds
+        for key, value in counts.items():
+            stats[key] = stats.get(key, 0) + value
+        stats['clues'] = filled
+        stats['target'] = clues
+        stats['reached'] = filled == clues
+    return board, solution
+
+def generate_sudoku(difficulty='medium', mode=None, stats=None, rng=None):
+    """
+    生成一个有唯一解的数独。挖洞（incremental / full）停在难度范围上限之上时，改用 generate_with_clues 重新生成
+    Args:
+        difficulty: 'easy'、'medium' 或 'hard'，决定保留的数字数量
+        mode: 'incremental'、'full'、'transform' 或 'targeted'，默认为 DEFAULT_GENERATOR_MODE
+        stats (dict, optional): 如果提供，累加 uniqueness_checks（唯一性检查次数）、nodes（搜索节点数）、
+            fill_attempts（填充完整解时尝试的数字数）、removals_rejected（被撤销的挖洞次数）、
+            fill_seconds 和 dig_seconds（两个阶段的耗时），并写入 clues（实际保留的数字数量）
+        rng (random.Random, optional): 随机数生成器，默认使用 random 模块；传入固定种子的 Random 时结果可复现
+    Returns:
+        tuple: (board, solution)
+    """
+    mode = mode or DEFAULT_GENERATOR_MODE
+    if mode not in ('incremental', 'full', 'transform', 'targeted'):
+        raise ValueError(f"Unknown generator mode: {mode}")
+    rng = rng or random
+    level = difficulty if difficulty in DIFFICULTY_RANGES else 'medium'
+    if mode == 'targeted':
+        metrics.inc('sudoku_generator_puzzles_total', difficulty=level, mode=mode)
+        return generate_with_clues(rng.randint(*DIFFICULTY_RANGES[level]), DEFAULT_SYMMETRY, stats=stats, rng=rng)
+    if mode == 'transform':
+        puzzle = transformed_puzzle(level, rng)
+        if puzzle is not None:
+            metrics.inc('sudoku_generator_puzzles_total', difficulty=level, mode=mode)
+            if stats is not None:
+                stats.setdefault('uniqueness_checks', 0)
+                stats.setdefault('nodes', 0)
+                stats['clues'] = sum(1 for line in puzzle[0] for num in line if num)
+            return puzzle
+        # 种子库中没有该难度的谜题时退回挖洞生成
+        mode = 'incremental'
+    # 计数总是在本地累加，结束时写入 metrics
+    counts = {'uniqueness_checks': 0, 'nodes': 0, 'fill_attempts': 0, 'removals_rejected': 0}
+
+    min_numbers, max_numbers = DIFFICULTY_RANGES.get(difficulty, (25, 30))  # 默认中等难度
+    
+    board = [[0]*9 for _ in range(9)]
+    grid = Board(board)
+    solution = None
+    
+    # 首先生成一个完整的有效数独
+    start = time.perf_counter()
+    _fill_grid(grid, rng, counts)
+    solution = copy.deepcopy(board)
+    fill_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    
+    # 获取所有填充的位置
+    filled_positions = [(i, j) for i in range(9) for j in range(9)]
+    rng.shuffle(filled_positions)
+    
+    # 计算需要移除的数字数量
+    total_numbers = 81
+    target_numbers = rng.randint(min_numbers, max_numbers)
+    numbers_to_remove = total_numbers - target_numbers
+    
+    # 逐个移除数字，确保保持唯一解
+    removed = 0
+    for pos in filled_positions:
+        if removed >= numbers_to_remove:
+            break
+            
+        row, col = pos
+        temp = board[row][col]
+        grid.clear(row, col)
+        counts['uniqueness_checks'] += 1
+        
+        # 如果移除后不再具有唯一解，恢复该数字
+        if mode == 'incremental':
+            unique = not has_alternative(grid, row, col, temp, counts)
+        else:
+            board_copy = copy.deepcopy(board)
+            unique = has_unique_solution(board_copy, stats=counts, use_cache=False)
+        if not unique:
+            grid.place(row, col, temp)
+            counts['removals_rejected'] += 1
+        else:
+            removed += 1
+    dig_seconds = time.perf_counter() - start
+
+    # 挖洞停在难度上限之上时（hard 较常见）改用 generate_with_clues，保证提示数符合难度
+    fallback = 81 - removed > max_numbers
+    metrics.inc('sudoku_generator_puzzles_total', difficulty=level, mode='targeted' if fallback else mode)
+    metrics.inc('sudoku_generator_fill_attempts_total', counts['fill_attempts'])
+    metrics.inc('sudoku_generator_removals_tried_total', counts['uniqueness_checks'])
+    metrics.inc('sudoku_generator_removals_rejected_total', counts['removals_rejected'])
+    metrics.inc('sudoku_generator_nodes_total', counts['nodes'])
+    metrics.observe('sudoku_generator_phase_seconds', fill_seconds, phase='fill')
+    metrics.observe('sudoku_generator_phase_seconds', dig_seconds, phase='dig')
+    if stats is not None:
+        counts['fill_seconds'] = fill_seconds
+        counts['dig_seconds'] = dig_seconds
+        for key, value in counts.items():
+            stats[key] = stats.get(key, 0) + value
+        stats['clues'] = 81 - removed
+
+    if fallback:
+        metrics.inc('sudoku_generator_fallbacks_total', difficulty=level)
+        return generate_with_clues(rng.randint(min_numbers, max_numbers), DEFAULT_SYMMETRY, stats=stats, rng=rng)
+    return board, solution
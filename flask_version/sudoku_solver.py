@@ -5,34 +5,78 @@ Copyright (c) 2025 Sudoku Tips Giver
 Sudoku solving algorithm implementation and hint generation.
 """
 
-from functions import Board, is_valid
-import copy
+from functions import Board, has_conflicts, UNITS, POPCOUNT, MASK_DIGITS, ALL_DIGITS, DEFAULT_TIE_BREAK
+from dlx_solver import dlx_solutions
+from result_cache import LRUCache
+from techniques import logical_hint, TECHNIQUE_NAMES
+from metrics import metrics
+from search_budget import BudgetExceeded
+from wire import decode_board, decode_string, encode_string
+import os
+import random
+import time
 
-def solve_sudoku(board):
+# 求解后端: 'mrv'（约束传播 + 最少候选数优先）、'backtrack'（逐格回溯）或 'dlx'（Dancing Links 精确覆盖）
+DEFAULT_BACKEND = os.environ.get('SUDOKU_SOLVER_BACKEND', 'mrv')
+
+# 进程内结果缓存，键为 board_key 得到的 81 位字符串
+solution_cache = LRUCache(
+    int(os.environ.get('SOLUTION_CACHE_SIZE', 4096)),
+    float(os.environ.get('SOLUTION_CACHE_TTL', 3600)),
+)
+hint_cache = LRUCache(
+    int(os.environ.get('HINT_CACHE_SIZE', 4096)),
+    float(os.environ.get('HINT_CACHE_TTL', 3600)),
+)
+
+def board_key(board):
+    """
+    把棋盘规范化为 81 位数字字符串，用作缓存键
+    Args:
+        board: 数独棋盘（二维列表）
+    Returns:
+        str: 81 位数字，与去掉分隔符的 board_to_string 结果相同
+    """
+    return encode_string(board)
+
+def solve_sudoku(board, backend=None):
     """
-    使用回溯法解数独
+    解数独，结果直接写入 board
     Args:
         board: 数独棋盘（二维列表）
+        backend: 求解后端名称，默认为 DEFAULT_BACKEND
     Returns:
         bool: 是否找到解
     """
-    # 找到一个空位置
-    empty = find_empty(board)
-    if not empty:
+    if _backend_name(backend) == 'backtrack':
+        if has_conflicts(board):
+            return False
+        grid = Board(board)
+        return _solve(grid, grid.empty_cells(), 0)
+
+    solutions = find_solutions(board, limit=1, backend=backend)
+    if not solutions:
+        return False
+    for i in range(9):
+        board[i][:] = solutions[0][i]
+    return True
+
+def _solve(grid, empties, index):
+    # 按行优先顺序取下一个空位置
+    if index == len(empties):
         return True
-    
-    row, col = empty
-    
-    # 尝试填入1-9
-    for num in range(1, 10):
-        if is_valid(board, row, col, num):
-            board[row][col] = num
-            
-            if solve_sudoku(board):
-                return True
-            
-            board[row][col] = 0
-    
+
+    row, col = empties[index]
+
+    # 尝试所有候选数字
+    for num in grid.candidate_list(row, col):
+        grid.place(row, col, num)
+
+        if _solve(grid, empties, index + 1):
+            return True
+
+        grid.clear(row, col)
+
     return False
 
 def find_empty(board):
@@ -49,107 +93,403 @@ def find_empty(board):
                 return (i, j)
     return None
 
-def count_solutions(board, limit=2):
+def _search(grid, empties, index, limit, solutions, stats, budget=None):
+    """在 grid 上原地回溯，收集最多 limit 个解"""
+    if stats is not None:
+        stats['nodes'] += 1
+    if budget is not None:
+        budget.charge()
+    if index == len(empties):
+        solutions.append([row[:] for row in grid.board])
+        return
+
+    row, col = empties[index]
+    for num in grid.candidate_list(row, col):
+        grid.place(row, col, num)
+        _search(grid, empties, index + 1, limit, solutions, stats, budget)
+        grid.clear(row, col)
+
+        # 如果已经找到足够的解，可以提前返回
+        if len(solutions) >= limit:
+            return
+
+def _init_stats(stats):
+    if stats is not None:
+        stats.setdefault('nodes', 0)
+    return stats
+
+def backtrack_solutions(board, limit=2, stats=None, budget=None):
     """
-    计算数独解的数量，最多计算到limit个
+    使用回溯法查找数独的解，最多找到 limit 个
     Args:
-        board: 数独棋盘
+        board: 数独棋盘，不会被修改
         limit: 解的数量上限
+        stats (dict, optional): 搜索节点数累加到 stats['nodes']
+        budget (SearchBudget, optional): 搜索预算，用完时抛出 BudgetExceeded
     Returns:
-        int: 解的数量
+        list: 解的列表
     """
     solutions = []
-    
-    def solve_recursive(board):
-        if len(solutions) >= limit:
-            return
-        
-        empty = find_empty(board)
-        if not empty:
-            solutions.append(copy.deepcopy(board))
-            return
-        
-        row, col = empty
-        for num in range(1, 10):
-            if is_valid(board, row, col, num):
-                board[row][col] = num
-                solve_recursive(board)
-                board[row][col] = 0
-    
-    board_copy = copy.deepcopy(board)
-    solve_recursive(board_copy)
-    return len(solutions)
-
-def has_unique_solution(board):
-    """检查数独是否有唯一解"""
-    def solve_with_limit(board, limit=2):
-        solutions = []
-        
-        def solve_recursive(board):
-            if len(solutions) >= limit:
-                return
-            
-            # 找到一个空位置
-            empty = None
-            for i in range(9):
-                for j in range(9):
-                    if board[i][j] == 0:
-                        empty = (i, j)
+    grid = Board([row[:] for row in board])
+    _search(grid, grid.empty_cells(), 0, limit, solutions, _init_stats(stats), budget)
+    return solutions
+
+def _propagate(grid, trail):
+    """
+    反复填入唯一候选数（naked single）和隐性唯一数（hidden single），直到没有进展
+    Args:
+        grid: Board 对象，原地修改
+        trail: 记录本次填入的格子，用于回溯时撤销
+    Returns:
+        bool: False 表示出现矛盾
+    """
+    board = grid.board
+    progress = True
+    while progress:
+        progress = False
+
+        # 唯一候选数：某格只剩一个候选
+        for row in range(9):
+            line = board[row]
+            for col in range(9):
+                if line[col] == 0:
+                    mask = grid.candidates(row, col)
+                    if not mask:
+                        return False
+                    if POPCOUNT[mask] == 1:
+                        grid.place(row, col, MASK_DIGITS[mask][0])
+                        trail.append((row, col))
+                        progress = True
+
+        # 隐性唯一数：某数字在一个单元中只能放在一个格子
+        for unit in UNITS:
+            once = twice = placed = 0
+            for row, col in unit:
+                num = board[row][col]
+                if num:
+                    placed |= 1 << (num - 1)
+                else:
+                    mask = grid.candidates(row, col)
+                    twice |= once & mask
+                    once |= mask
+            if once | placed != ALL_DIGITS:
+                return False
+            singles = once & ~twice
+            if not singles:
+                continue
+            for num in MASK_DIGITS[singles]:
+                bit = 1 << (num - 1)
+                for row, col in unit:
+                    if board[row][col] == 0 and grid.candidates(row, col) & bit:
+                        grid.place(row, col, num)
+                        trail.append((row, col))
                         break
-                if empty:
+                else:
+                    # 该格子已被同一单元的另一个隐性唯一数占用
+                    return False
+            progress = True
+
+    return True
+
+def _mrv_search(grid, limit, solutions, stats, budget=None):
+    """约束传播后选择候选数最少的格子分支，收集最多 limit 个解"""
+    if stats is not None:
+        stats['nodes'] += 1
+    if budget is not None:
+        budget.charge()
+    trail = []
+    if _propagate(grid, trail):
+        best = None
+        best_count = 10
+        for row in range(9):
+            for col in range(9):
+                if grid.board[row][col] == 0:
+                    count = POPCOUNT[grid.candidates(row, col)]
+                    if count < best_count:
+                        best, best_count = (row, col), count
+            if best_count == 2:
+                break
+
+        if best is None:
+            solutions.append([line[:] for line in grid.board])
+        else:
+            row, col = best
+            for num in grid.candidate_list(row, col):
+                grid.place(row, col, num)
+                _mrv_search(grid, limit, solutions, stats, budget)
+                grid.clear(row, col)
+                if len(solutions) >= limit:
                     break
-            
-            # 如果没有空位置，说明找到了一个解
-            if not empty:
-                solutions.append([row[:] for row in board])
-                return
-            
-            row, col = empty
-            # 尝试1-9的数字
-            for num in range(1, 10):
-                if is_valid(board, row, col, num):
-                    board[row][col] = num
-                    solve_recursive(board)
-                    board[row][col] = 0
-                    
-                    # 如果已经找到两个解，可以提前返回
-                    if len(solutions) >= limit:
-                        return
-        
-        board_copy = [row[:] for row in board]
-        solve_recursive(board_copy)
-        return solutions
-    
+
+    for row, col in reversed(trail):
+        grid.clear(row, col)
+
+def mrv_solutions(board, limit=2, stats=None, budget=None):
+    """
+    使用约束传播 + 最少候选数优先（MRV）查找数独的解，最多找到 limit 个
+    Args:
+        board: 数独棋盘，不会被修改
+        limit: 解的数量上限
+        stats (dict, optional): 搜索节点数累加到 stats['nodes']
+        budget (SearchBudget, optional): 搜索预算，用完时抛出 BudgetExceeded
+    Returns:
+        list: 解的列表
+    """
+    solutions = []
+    _mrv_search(Board([row[:] for row in board]), limit, solutions, _init_stats(stats), budget)
+    return solutions
+
+def has_completion(grid, stats=None):
+    """
+    判断 Board 当前状态是否至少有一个完整解。直接在 grid 上搜索，返回前恢复原状，不复制棋盘
+    Args:
+        grid: Board 对象
+        stats (dict, optional): 搜索节点数累加到 stats['nodes']
+    Returns:
+        bool: 是否有解
+    """
+    solutions = []
+    _mrv_search(grid, 1, solutions, _init_stats(stats))
+    return bool(solutions)
+
+BACKENDS = {
+    'mrv': mrv_solutions,
+    'backtrack': backtrack_solutions,
+    'dlx': dlx_solutions,
+}
+
+def _backend_name(backend):
+    name = backend or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown solver backend: {name}")
+    return name
+
+def find_solutions(board, limit=2, backend=None, stats=None, budget=None):
+    """
+    使用指定后端查找数独的解，最多找到 limit 个
+    Args:
+        board: 数独棋盘，不会被修改
+        limit: 解的数量上限
+        backend: 求解后端名称，默认为 DEFAULT_BACKEND
+        stats (dict, optional): 搜索节点数累加到 stats['nodes']
+        budget (SearchBudget, optional): 节点数和时间预算，用完时抛出 BudgetExceeded
+    Returns:
+        list: 解的列表；已知数字互相冲突时为空
+    """
+    backend = _backend_name(backend)
+    # 各后端只检查空格的候选数，已知数字之间的冲突在这里统一判断，保证所有后端结果一致
+    if has_conflicts(board):
+        return []
+    return BACKENDS[backend](board, limit, stats, budget)
+
+def count_solutions(board, limit=2, backend=None, stats=None, use_cache=True, budget=None):
+    """
+    计算数独解的数量，最多计算到limit个
+    Args:
+        board: 数独棋盘
+        limit: 解的数量上限
+        backend: 求解后端名称，默认为 DEFAULT_BACKEND
+        stats (dict, optional): 搜索节点数累加到 stats['nodes']；提供时不使用缓存
+        use_cache: 是否使用 solution_cache
+        budget (SearchBudget, optional): 搜索预算，用完时抛出 BudgetExceeded，结果不缓存
+    Returns:
+        int: 解的数量
+    """
+    if not use_cache or stats is not None:
+        return _search_count(board, limit, backend, stats, budget)
+
+    key = (board_key(board), limit)
+    count = solution_cache.get(key)
+    if count is None:
+        count = _search_count(board, limit, backend, None, budget)
+        solution_cache.put(key, count)
+    return count
+
+def _search_count(board, limit, backend, stats, budget):
+    # 记录每次实际搜索的耗时和节点数
+    backend = _backend_name(backend)
+    search_stats = {}
+    start = time.perf_counter()
+    try:
+        count = len(find_solutions(board, limit, backend, search_stats, budget))
+    except BudgetExceeded as e:
+        metrics.inc('sudoku_search_budget_exhausted_total', backend=backend, reason=e.reason)
+        raise
+    finally:
+        metrics.observe('sudoku_solver_search_seconds', time.perf_counter() - start, backend=backend)
+        metrics.inc('sudoku_solver_searches_total', backend=backend, limit=limit)
+        metrics.inc('sudoku_solver_nodes_total', search_stats.get('nodes', 0), backend=backend)
+        if stats is not None:
+            stats['nodes'] = stats.get('nodes', 0) + search_stats.get('nodes', 0)
+    return count
+
+def has_unique_solution(board, backend=None, stats=None, use_cache=True, budget=None):
+    """检查数独是否有唯一解；提供 budget 时预算用完会抛出 BudgetExceeded"""
     # 寻找最多两个解，如果找到两个就说明不是唯一解
-    solutions = solve_with_limit(board)
-    return len(solutions) == 1
+    return count_solutions(board, limit=2, backend=backend, stats=stats, use_cache=use_cache, budget=budget) == 1
+
+# 搜索预算用完、无法判断是否有唯一解时 analyze_hint 返回的信息；这个结果不缓存
+UNDETERMINED = "这个数独的空格太多或存在很深的矛盾，无法在限定的计算量内判断，请再填入一些数字后重试"
 
-def get_next_hint(board):
+# 批量提示中某个棋盘没能在时限内算完时的结果；这个结果不缓存
+TIMED_OUT = "计算超时，请稍后重试"
+
+def analyze_hint(board, budget=None):
     """
-    获取下一步最佳提示
+    get_next_hint 中与随机选择无关的部分。
+    先做唯一性检查（结果缓存在 solution_cache 中），没有唯一解时不给出任何推理；
+    然后按代价从低到高尝试人工解题技巧，逻辑推理无法继续时找出所有候选数最少的格子
     Args:
         board: 数独棋盘
+        budget (SearchBudget, optional): 唯一性检查的搜索预算，用完时返回 UNDETERMINED
     Returns:
-        tuple: (row, col, num, message) 或 None
+        str 或 tuple: 无法给出提示时返回提示信息，否则返回 ((row, col, possible_nums, technique, cells), ...)，
+        technique 为使用的最难技巧（搜索得到时为 None），cells 为推理涉及的格子
     """
-    # 首先检查是否有唯一解
-    if not has_unique_solution(board):
-        return None, "这个数独没有唯一解！"
-    
+    # is_consistent 只能发现表面的矛盾，填错一个数字的棋盘仍可能推出看似确定的数字，所以先检查唯一解
+    try:
+        if not has_unique_solution(board, budget=budget):
+            return "这个数独没有唯一解！"
+    except BudgetExceeded:
+        return UNDETERMINED
+
+    deduction = logical_hint(board)
+    if deduction is not None:
+        cells = tuple(deduction['cells'])
+        return ((deduction['row'], deduction['col'], (deduction['number'],), deduction['technique'], cells),)
+
     # 找到约束最多的空格
-    row, col, constraint = Board(board).find_constraint()
-    if row == -1 or col == -1:
-        return None, "数独已完成！"
-    
-    # 找到这个位置可以填的数字
-    possible_nums = []
-    for num in range(1, 10):
-        if is_valid(board, row, col, num):
-            possible_nums.append(num)
-    
-    if len(possible_nums) == 1:
+    grid = Board(board)
+    constraint, cells = grid.most_constrained_cells()
+    if not cells:
+        return "数独已完成！"
+
+    # 以及这些位置可以填的数字
+    return tuple((row, col, grid.candidate_list(row, col), None, ()) for row, col in cells)
+
+def analyze_hints(boards, budget=None):
+    """对多个棋盘依次调用 analyze_hint，每个棋盘使用一份新的预算"""
+    return [analyze_hint(board, budget.renew() if budget is not None else None) for board in boards]
+
+def _pick_hint(analysis):
+    """
+    从 analyze_hint 的结果中选择一个格子（按 DEFAULT_TIE_BREAK 随机选择或取行优先顺序的第一个），
+    返回 (row, col, num, message, possible_nums, technique, cells)
+    """
+    choice = analysis[0] if DEFAULT_TIE_BREAK == 'first' else random.choice(analysis)
+    row, col, possible_nums, technique, cells = choice
+    possible_nums = list(possible_nums)
+
+    if technique is not None:
+        message = f"在第{row+1}行第{col+1}列，只能填入数字{possible_nums[0]}（{TECHNIQUE_NAMES[technique]}）"
+    elif len(possible_nums) == 1:
         message = f"在第{row+1}行第{col+1}列，只能填入数字{possible_nums[0]}"
     else:
         message = f"在第{row+1}行第{col+1}列，可以填入的数字有: {possible_nums}"
-    
-    return (row, col, possible_nums[0] if len(possible_nums) == 1 else None, message) 
\ No newline at end of file
+
+    return (row, col, possible_nums[0] if len(possible_nums) == 1 else None, message, possible_nums,
+            technique, [list(cell) for cell in cells])
+
+def hint_analysis(board, analyze=None, analysis=None):
+    """
+    获取棋盘的 analyze_hint 结果，优先使用 hint_cache
+    Args:
+        board: 数独棋盘
+        analyze: 可选，代替 analyze_hint 执行搜索的函数（例如提交到进程池）
+        analysis: 可选，已知的 analyze_hint 结果（例如来自预先记录的解题路径），提供时不查缓存也不搜索
+    """
+    if analysis is None:
+        key = board_key(board)
+        analysis = hint_cache.get(key)
+        if analysis is None:
+            analysis = (analyze or analyze_hint)(board)
+            if analysis not in (UNDETERMINED, TIMED_OUT):
+                hint_cache.put(key, analysis)
+    return analysis
+
+def get_next_hint(board, analyze=None, details=False, analysis=None):
+    """
+    获取下一步最佳提示
+    Args:
+        board: 数独棋盘
+        analyze: 可选，代替 analyze_hint 执行搜索的函数（例如提交到进程池）
+        details: 为 True 时额外返回使用的技巧和涉及的格子
+        analysis: 可选，已知的 analyze_hint 结果（例如来自预先记录的解题路径），提供时不查缓存也不搜索
+    Returns:
+        tuple: (row, col, num, message) 或 (None, message)；
+        details 为 True 时为 (row, col, num, message, technique, cells)
+    """
+    analysis = hint_analysis(board, analyze, analysis)
+    if isinstance(analysis, str):
+        return None, analysis
+    row, col, num, message, possible_nums, technique, cells = _pick_hint(analysis)
+    if details:
+        return row, col, num, message, technique, cells
+    return row, col, num, message
+
+def hint_result(analysis, board):
+    """
+    把 analyze_hint 的结果整理成 /get_hint 和 /get_hints 的响应字典（两个接口共用，保证格式一致）
+    Args:
+        analysis: analyze_hint 的结果
+        board: 数独棋盘，用于计算提示格子的所有候选数和是否属于候选数最少的格子
+    """
+    if isinstance(analysis, str):
+        if analysis == TIMED_OUT:
+            return {'success': False, 'undetermined': False, 'error': 'timeout', 'message': analysis}
+        return {'success': False, 'undetermined': analysis == UNDETERMINED, 'message': analysis}
+
+    row, col, num, message, possible_nums, technique, cells = _pick_hint(analysis)
+    grid = Board(board)
+    # 提示的格子是否属于可能性最少的格子（使用棋盘的候选数索引，不受随机选择影响）
+    constraint, min_cells = grid.most_constrained_cells()
+    return {
+        'success': True,
+        'row': row,
+        'col': col,
+        'number': num,  # 如果只有一个可能的数字，这里会有值
+        'possible_numbers': list(grid.candidate_list(row, col)),  # 这个位置所有可能的数字
+        'is_minimal': (row, col) in min_cells,  # 标记是否是最少可能性的格子
+        'technique': technique,  # 推理使用的技巧，搜索得到时为 None
+        'cells': cells,  # 推理涉及的格子
+        'message': message
+    }
+
+def get_next_hints(boards, analyze_many=None):
+    """
+    批量获取提示，相同的棋盘只计算一次，已缓存的棋盘不再计算
+    Args:
+        boards: 棋盘列表，每个棋盘可以是二维列表或 81 位数字字符串（见 wire.decode_board）
+        analyze_many: 可选，代替 analyze_hints 执行搜索的函数（例如分块提交到进程池，超时的棋盘返回 TIMED_OUT）
+    Returns:
+        list: 与 boards 一一对应的结果字典；单个棋盘出错时该项为 {'success': False, 'message': ...}
+    """
+    keys = []
+    for board in boards:
+        try:
+            keys.append(board_key(decode_board(board)))
+        except (TypeError, ValueError):
+            keys.append(None)
+
+    analyses = {}
+    missing = []
+    for key in keys:
+        if key is None or key in analyses or key in missing:
+            continue
+        analysis = hint_cache.get(key)
+        if analysis is None:
+            missing.append(key)
+        else:
+            analyses[key] = analysis
+
+    if missing:
+        computed = (analyze_many or analyze_hints)([decode_string(key) for key in missing])
+        for key, analysis in zip(missing, computed):
+            if analysis not in (UNDETERMINED, TIMED_OUT):
+                hint_cache.put(key, analysis)
+            analyses[key] = analysis
+
+    return [
+        hint_result(analyses[key], decode_string(key)) if key is not None else {'success': False, 'message': '无效的棋盘数据'}
+        for key in keys
+    ]
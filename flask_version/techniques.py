@@ -0,0 +1,314 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Human solving techniques used to explain hints without backtracking.
+
+Every technique works on a 9x9 grid of candidate masks (0 for filled cells) and returns the first
+deduction it finds, or None. A deduction is a dict:
+    technique (str): The technique key (see TECHNIQUES).
+    placement (tuple or None): (row, col, num) if the deduction places a number.
+    eliminations (list): (row, col, num) candidates the deduction removes.
+    cells (list): The (row, col) cells the deduction is based on.
+"""
+
+from functions import Board, UNITS, PEERS, POPCOUNT, MASK_DIGITS, BOX_INDEX, ALL_DIGITS
+
+ROW_UNITS = UNITS[0:9]
+COL_UNITS = UNITS[9:18]
+BOX_UNITS = UNITS[18:27]
+
+
+def _deduction(technique, cells, placement=None, eliminations=()):
+    return {
+        'technique': technique,
+        'placement': placement,
+        'eliminations': list(eliminations),
+        'cells': list(cells),
+    }
+
+
+def _cells_with(cands, unit, bit):
+    return [(row, col) for row, col in unit if cands[row][col] & bit]
+
+
+def initial_candidates(board, grid=None):
+    """
+    Build the candidate mask grid of a board.
+    Args:
+        board (list of list of int): The 9x9 Sudoku board.
+        grid (Board, optional): A Board over the same list whose digit masks are up to date; saves
+            rebuilding them.
+    Returns:
+        list of list of int: Candidate masks, 0 for filled cells.
+    """
+    grid = grid or Board(board)
+    return [[grid.candidates(row, col) if board[row][col] == 0 else 0 for col in range(9)] for row in range(9)]
+
+
+def is_consistent(board, cands):
+    """
+    Check that no unit repeats a digit, no empty cell has run out of candidates and
+    every digit still has a place in every unit.
+    Args:
+        board (list of list of int): The 9x9 Sudoku board.
+        cands (list of list of int): The candidate masks.
+    Returns:
+        bool: False if the position is contradictory.
+    """
+    for unit in UNITS:
+        placed = 0
+        possible = 0
+        for row, col in unit:
+            num = board[row][col]
+            if num:
+                bit = 1 << (num - 1)
+                if placed & bit:
+                    return False
+                placed |= bit
+            elif not cands[row][col]:
+                return False
+            else:
+                possible |= cands[row][col]
+        if placed | possible != ALL_DIGITS:
+            return False
+    return True
+
+
+def find_naked_single(cands):
+    """唯一候选数：某格只剩一个候选数字"""
+    for row in range(9):
+        for col in range(9):
+            mask = cands[row][col]
+            if mask and POPCOUNT[mask] == 1:
+                return _deduction('naked_single', [(row, col)], placement=(row, col, MASK_DIGITS[mask][0]))
+    return None
+
+
+def find_hidden_single(cands):
+    """隐性唯一数：某数字在一个单元中只剩一个位置"""
+    for unit in UNITS:
+        once = twice = 0
+        for row, col in unit:
+            mask = cands[row][col]
+            twice |= once & mask
+            once |= mask
+        singles = once & ~twice
+        if singles:
+            num = MASK_DIGITS[singles][0]
+            row, col = _cells_with(cands, unit, 1 << (num - 1))[0]
+            return _deduction('hidden_single', unit, placement=(row, col, num))
+    return None
+
+
+def find_locked_candidates(cands):
+    """区块摒除：宫内某数字只在一行（列）中，或行（列）内某数字只在一个宫中"""
+    for num in range(1, 10):
+        bit = 1 << (num - 1)
+        # 宫 -> 行/列 (pointing)
+        for box_unit in BOX_UNITS:
+            cells = _cells_with(cands, box_unit, bit)
+            if len(cells) < 2:
+                continue
+            for index, lines in ((0, ROW_UNITS), (1, COL_UNITS)):
+                if len({cell[index] for cell in cells}) == 1:
+                    line = lines[cells[0][index]]
+                    eliminations = [(row, col, num) for row, col in _cells_with(cands, line, bit)
+                                    if (row, col) not in box_unit]
+                    if eliminations:
+                        return _deduction('locked_candidates', cells, eliminations=eliminations)
+        # 行/列 -> 宫 (claiming)
+        for line in ROW_UNITS + COL_UNITS:
+            cells = _cells_with(cands, line, bit)
+            if len(cells) < 2 or len({BOX_INDEX[row][col] for row, col in cells}) != 1:
+                continue
+            box_unit = BOX_UNITS[BOX_INDEX[cells[0][0]][cells[0][1]]]
+            eliminations = [(row, col, num) for row, col in _cells_with(cands, box_unit, bit)
+                            if (row, col) not in line]
+            if eliminations:
+                return _deduction('locked_candidates', cells, eliminations=eliminations)
+    return None
+
+
+def find_naked_pair(cands):
+    """显性数对：一个单元中两个格子的候选数是同样的两个数字"""
+    for unit in UNITS:
+        pairs = {}
+        for row, col in unit:
+            mask = cands[row][col]
+            if POPCOUNT[mask] == 2:
+                pairs.setdefault(mask, []).append((row, col))
+        for mask, cells in pairs.items():
+            if len(cells) != 2:
+                continue
+            eliminations = [(row, col, num) for row, col in unit if (row, col) not in cells
+                            for num in MASK_DIGITS[cands[row][col] & mask]]
+            if eliminations:
+                return _deduction('naked_pair', cells, eliminations=eliminations)
+    return None
+
+
+def find_hidden_pair(cands):
+    """隐性数对：一个单元中两个数字只出现在同样的两个格子里"""
+    for unit in UNITS:
+        positions = {}
+        for num in range(1, 10):
+            cells = _cells_with(cands, unit, 1 << (num - 1))
+            if len(cells) == 2:
+                positions.setdefault(tuple(cells), []).append(num)
+        for cells, nums in positions.items():
+            if len(nums) != 2:
+                continue
+            keep = (1 << (nums[0] - 1)) | (1 << (nums[1] - 1))
+            eliminations = [(row, col, num) for row, col in cells
+                            for num in MASK_DIGITS[cands[row][col] & ~keep]]
+            if eliminations:
+                return _deduction('hidden_pair', cells, eliminations=eliminations)
+    return None
+
+
+def find_x_wing(cands):
+    """X-Wing：某数字在两行中都只出现在同样的两列（或两列中同样的两行）"""
+    for num in range(1, 10):
+        bit = 1 << (num - 1)
+        for index, lines in ((1, ROW_UNITS), (0, COL_UNITS)):
+            seen = {}
+            for line in lines:
+                cells = _cells_with(cands, line, bit)
+                if len(cells) != 2:
+                    continue
+                key = (cells[0][index], cells[1][index])
+                if key not in seen:
+                    seen[key] = cells
+                    continue
+                corners = seen[key] + cells
+                crossing = COL_UNITS if index == 1 else ROW_UNITS
+                eliminations = [(row, col, num) for other in key for row, col in _cells_with(cands, crossing[other], bit)
+                                if (row, col) not in corners]
+                if eliminations:
+                    return _deduction('x_wing', corners, eliminations=eliminations)
+    return None
+
+
+# 按代价从低到高排列：(key, 中文名称, 查找函数)
+TECHNIQUES = (
+    ('naked_single', '唯一候选数', find_naked_single),
+    ('hidden_single', '隐性唯一数', find_hidden_single),
+    ('locked_candidates', '区块摒除', find_locked_candidates),
+    ('naked_pair', '显性数对', find_naked_pair),
+    ('hidden_pair', '隐性数对', find_hidden_pair),
+    ('x_wing', 'X-Wing', find_x_wing),
+)
+TECHNIQUE_NAMES = {key: name for key, name, _ in TECHNIQUES}
+TECHNIQUE_RANK = {key: rank for rank, (key, _, _) in enumerate(TECHNIQUES)}
+
+
+def find_deduction(cands):
+    """
+    Try every technique in order of cost and return the first deduction.
+    Args:
+        cands (list of list of int): The candidate masks.
+    Returns:
+        dict: The deduction, or None if no technique applies.
+    """
+    for _, _, finder in TECHNIQUES:
+        deduction = finder(cands)
+        if deduction is not None:
+            return deduction
+    return None
+
+
+def apply_eliminations(cands, deduction):
+    """
+    Remove the eliminated candidates of a deduction from cands in place.
+    """
+    for row, col, num in deduction['eliminations']:
+        cands[row][col] &= ~(1 << (num - 1))
+
+
+def place(board, cands, row, col, num):
+    """
+    Place a number on board and remove it from the candidates of the cell's peers.
+    """
+    board[row][col] = num
+    cands[row][col] = 0
+    bit = ~(1 << (num - 1))
+    for peer_row, peer_col in PEERS[row][col]:
+        cands[peer_row][peer_col] &= bit
+
+
+def logical_hint(board, grid=None):
+    """
+    Find the next number that can be placed by logic alone.
+    Elimination-only deductions (locked candidates, pairs, X-Wing) are applied on a private
+    candidate grid until a single appears.
+    Args:
+        board (list of list of int): The 9x9 Sudoku board; it is not modified.
+        grid (Board, optional): A Board over board, see initial_candidates.
+    Returns:
+        dict: {row, col, number, technique, cells, steps} where technique is the hardest technique
+              used, cells are all cells the deductions are based on and steps lists the
+              techniques in order; None if the position is contradictory or logic gets stuck.
+    """
+    cands = initial_candidates(board, grid)
+    steps = []
+    cells = []
+    while is_consistent(board, cands):
+        deduction = find_deduction(cands)
+        if deduction is None:
+            return None
+        steps.append(deduction['technique'])
+        for cell in deduction['cells']:
+            if cell not in cells:
+                cells.append(cell)
+        if deduction['placement'] is not None:
+            row, col, num = deduction['placement']
+            return {
+                'row': row,
+                'col': col,
+                'number': num,
+                'technique': max(steps, key=TECHNIQUE_RANK.get),
+                'cells': cells,
+                'steps': steps,
+            }
+        apply_eliminations(cands, deduction)
+    return None
+
+
+def logical_solve(board):
+    """
+    Solve as far as possible with the techniques alone.
+    Args:
+        board (list of list of int): The 9x9 Sudoku board; it is not modified.
+    Returns:
+        dict: {solved, hardest, steps, counts, board} where hardest is the hardest technique used
+              (None if no deduction was needed), steps the number of deductions, counts the number
+              of deductions per technique and board the position logic reached.
+    """
+    board = [row[:] for row in board]
+    cands = initial_candidates(board)
+    remaining = sum(row.count(0) for row in board)
+    hardest = None
+    counts = {}
+    steps = 0
+    while remaining and is_consistent(board, cands):
+        deduction = find_deduction(cands)
+        if deduction is None:
+            break
+        technique = deduction['technique']
+        steps += 1
+        counts[technique] = counts.get(technique, 0) + 1
+        if hardest is None or TECHNIQUE_RANK[technique] > TECHNIQUE_RANK[hardest]:
+            hardest = technique
+        if deduction['placement'] is not None:
+            place(board, cands, *deduction['placement'])
+            remaining -= 1
+        else:
+            apply_eliminations(cands, deduction)
+    return {
+        'solved': remaining == 0 and is_consistent(board, cands),
+        'hardest': hardest,
+        'steps': steps,
+        'counts': counts,
+        'board': board,
+    }
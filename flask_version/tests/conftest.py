@@ -0,0 +1,18 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Test configuration: the modules live flat in flask_version/, and the app is imported without
+solver processes, pre-generated puzzles or a session database.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('SOLVER_WORKERS', '0')
+os.environ.setdefault('PUZZLE_POOL_HIGH', '0')
+os.environ.setdefault('WARMUP_PUZZLES', '0')
+os.environ.setdefault('SESSION_DB', '')
+os.environ.setdefault('SUDOKU_TIE_BREAK', 'first')
@@ -0,0 +1,45 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for the vectorized batch_candidates against Board.
+"""
+
+import random
+
+import pytest
+
+from functions import Board, batch_candidates
+from sudoku_generator import generate_sudoku
+
+np = pytest.importorskip('numpy')
+
+
+def sample_boards():
+    rng = random.Random(8)
+    boards = [generate_sudoku(difficulty, mode='incremental', rng=rng)[0]
+              for difficulty in ('easy', 'medium', 'hard') for _ in range(5)]
+    solved = generate_sudoku('easy', mode='incremental', rng=rng)[1]
+    return boards + [[[0] * 9 for _ in range(9)], solved]
+
+
+def test_batch_candidates_matches_board():
+    boards = sample_boards()
+    masks, counts, best = batch_candidates(np.array(boards))
+    for i, board in enumerate(boards):
+        grid = Board([line[:] for line in board])
+        for row in range(9):
+            for col in range(9):
+                expected = 0 if board[row][col] else grid.candidates(row, col)
+                assert masks[i, row * 9 + col] == expected
+                assert counts[i, row * 9 + col] == bin(expected).count('1')
+        constraint, cells = grid.most_constrained_cells()
+        # 并列时取行优先顺序的第一个，与 most_constrained_cells 的第一个格子相同
+        assert best[i] == (cells[0][0] * 9 + cells[0][1] if cells else -1)
+
+
+def test_batch_candidates_rejects_invalid_arrays():
+    with pytest.raises(ValueError):
+        batch_candidates(np.zeros((2, 9, 8), dtype=int))
+    with pytest.raises(ValueError):
+        batch_candidates(np.full((1, 9, 9), 10))
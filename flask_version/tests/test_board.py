@@ -0,0 +1,47 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for the incremental most-constrained-cell index of Board.
+"""
+
+import random
+
+import pytest
+
+from functions import Board, CompactBoard
+from sudoku_generator import generate_sudoku
+
+
+def test_index_follows_place_and_clear():
+    rng = random.Random(3)
+    board, solution = generate_sudoku('medium', mode='incremental', rng=rng)
+    grid = Board([line[:] for line in board])
+    grid.most_constrained_cells()  # 建立索引，之后只做增量更新
+    for _ in range(200):
+        row, col = rng.randrange(9), rng.randrange(9)
+        if grid.board[row][col]:
+            grid.clear(row, col)
+        else:
+            grid.place(row, col, solution[row][col])
+        fresh = Board([line[:] for line in grid.board])
+        assert grid.most_constrained_cells() == fresh.most_constrained_cells()
+        constraint, cells = fresh.most_constrained_cells()
+        if cells:
+            assert grid.find_constraint('first') == (*cells[0], constraint)
+
+
+def test_compact_board_drafts_stay_in_their_cell():
+    board = CompactBoard()
+    for row, col in ((0, 0), (4, 5), (8, 8)):
+        for num in (1, 5, 9):
+            board.add_draft_number(row, col, num)
+    board.clear_draft_numbers(4, 5)
+    assert board.get_draft_numbers(0, 0) == [1, 5, 9]
+    assert board.get_draft_numbers(4, 5) == []
+    assert board.get_draft_mask(8, 8) == 0b100010001
+    for row, col, num in ((9, 0, 1), (0, -1, 1), (0, 0, 0), (0, 0, 10)):
+        with pytest.raises(IndexError):
+            board.add_draft_number(row, col, num)
+    with pytest.raises(IndexError):
+        board.get_draft_mask(0, 9)
@@ -0,0 +1,49 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for the solver process pool.
+"""
+
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from executor import SolverExecutor, DeadlineExceeded
+
+
+def sleep_and_return(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def crash():
+    os._exit(1)
+
+
+def test_run_all_reports_timeouts_per_call():
+    executor = SolverExecutor(2)
+    try:
+        executor.start()
+        results = executor.run_all(sleep_and_return, [(0.05,), (5,), (0.1,)], timeout=1)
+        assert results[0] == 0.05 and results[2] == 0.1
+        assert isinstance(results[1], DeadlineExceeded)
+        # 超时后工作进程仍然可用
+        assert executor.run(sleep_and_return, 0, timeout=1) == 0
+    finally:
+        executor.shutdown()
+
+
+def test_broken_pool_is_replaced_without_forking():
+    executor = SolverExecutor(2)
+    try:
+        executor.start()
+        with pytest.raises(BrokenProcessPool):
+            executor.run(crash, timeout=5)
+        # 新的进程池不再 fork 已经有多个线程的进程
+        assert executor.start_method != 'fork'
+        assert executor.run(sleep_and_return, 0, timeout=30) == 0
+    finally:
+        executor.shutdown()
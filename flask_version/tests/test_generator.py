@@ -0,0 +1,25 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for the puzzle generator.
+"""
+
+import random
+
+import pytest
+
+from sudoku_generator import generate_sudoku, DIFFICULTY_RANGES
+from sudoku_solver import count_solutions
+
+
+# 'targeted' 每个谜题可能用完检查次数（约 1 秒），少生成几个
+@pytest.mark.parametrize('mode, count', [('incremental', 20), ('targeted', 5)])
+def test_hard_puzzles_stay_in_their_clue_range(mode, count):
+    rng = random.Random(1)
+    min_numbers, max_numbers = DIFFICULTY_RANGES['hard']
+    for _ in range(count):
+        board, solution = generate_sudoku('hard', mode=mode, rng=rng)
+        assert min_numbers <= sum(1 for line in board for num in line if num) <= max_numbers
+        assert count_solutions(board, use_cache=False) == 1
+        assert all(num in (0, solution[row][col]) for row, line in enumerate(board) for col, num in enumerate(line))
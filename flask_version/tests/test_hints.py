@@ -0,0 +1,74 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for hint analysis and the /get_hint and /get_hints responses.
+"""
+
+import random
+
+import pytest
+
+from sudoku_generator import generate_sudoku
+from sudoku_solver import analyze_hint, count_solutions, hint_cache, solution_cache
+from functions import Board
+from techniques import logical_hint
+
+NO_UNIQUE_SOLUTION = "这个数独没有唯一解！"
+
+
+def wrong_digit_boards(count):
+    """Generated puzzles with one wrong digit that does not conflict with any clue."""
+    rng = random.Random(2025)
+    boards = []
+    while len(boards) < count:
+        board, solution = generate_sudoku(rng.choice(['easy', 'medium']), mode='incremental', rng=rng)
+        grid = Board([line[:] for line in board])
+        for row, col in grid.empty_cells():
+            wrong = [num for num in grid.candidate_list(row, col) if num != solution[row][col]]
+            if wrong:
+                grid.board[row][col] = wrong[0]
+                boards.append(grid.board)
+                break
+    return boards
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    hint_cache.clear()
+    solution_cache.clear()
+
+
+@pytest.fixture(scope='module')
+def client():
+    import app
+    return app.app.test_client()
+
+
+def test_unsolvable_board_gets_no_deduction():
+    boards = wrong_digit_boards(20)
+    # 逻辑推理在这些棋盘上大多仍能“推出”数字，必须由唯一性检查拦下
+    assert sum(logical_hint(board) is not None for board in boards) > 0
+    for board in boards:
+        assert count_solutions(board, limit=2) == 0
+        assert analyze_hint(board) == NO_UNIQUE_SOLUTION
+
+
+def test_get_hint_rejects_unsolvable_board(client):
+    board = wrong_digit_boards(1)[0]
+    data = client.post('/get_hint', json={'board': board}).json
+    assert data['success'] is False
+    assert data['message'] == NO_UNIQUE_SOLUTION
+
+
+def test_get_hint_and_get_hints_agree(client):
+    rng = random.Random(7)
+    boards = [generate_sudoku(difficulty, rng=rng)[0] for difficulty in ('easy', 'medium', 'hard')]
+    batch = client.post('/get_hints', json={'boards': boards}).json['results']
+    for board, result in zip(boards, batch):
+        hint_cache.clear()
+        single = client.post('/get_hint', json={'board': board}).json
+        assert single == result
+        grid = Board(board)
+        assert result['possible_numbers'] == list(grid.candidate_list(result['row'], result['col']))
+        assert result['is_minimal'] == ((result['row'], result['col']) in grid.most_constrained_cells()[1])
@@ -0,0 +1,28 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for merging metrics recorded in solver worker processes.
+"""
+
+from executor import SolverExecutor
+from metrics import metrics, collect, reset_metrics
+
+
+def record(name):
+    metrics.inc(name)
+    return True
+
+
+def test_forked_workers_do_not_merge_inherited_values():
+    metrics.inc('test_inherited_total', 5)
+    executor = SolverExecutor(2, initializer=reset_metrics)
+    try:
+        executor.start()  # 工作进程在这里 fork，复制了上面的计数
+        _, delta = executor.run(collect, record, 'test_worker_total', timeout=5)
+    finally:
+        executor.shutdown()
+    counters, _ = delta
+    assert counters == {('test_worker_total', ()): 1}
+    metrics.merge(delta)
+    assert metrics._counters[('test_inherited_total', ())] == 5
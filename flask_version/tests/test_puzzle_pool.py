@@ -0,0 +1,27 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for the background-refilled puzzle pool.
+"""
+
+import time
+
+from puzzle_pool import PuzzlePool
+
+
+def test_failing_generate_backs_off():
+    calls = []
+
+    def generate(difficulty):
+        calls.append(time.monotonic())
+        raise RuntimeError("solver pool is broken")
+
+    pool = PuzzlePool(generate, ['easy'], high_watermark=1, retry_delay=0.05, max_retry_delay=0.2)
+    pool.start()
+    time.sleep(0.6)
+    pool.stop()
+    # 等待 0.05、0.1、0.2、0.2... 秒，而不是不停重试
+    assert 3 <= len(calls) <= 6
+    assert pool.stats()['easy']['errors'] == len(calls)
+    assert all(b - a >= 0.04 for a, b in zip(calls, calls[1:]))
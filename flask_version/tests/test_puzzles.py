@@ -0,0 +1,57 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for the /generate and /puzzle/<id> responses.
+"""
+
+import datetime
+
+import pytest
+
+from puzzle_ids import daily_puzzle_id
+from wire import decode_string
+
+
+@pytest.fixture(scope='module')
+def app_module():
+    import app
+    return app
+
+
+def test_compact_generate_returns_puzzle_id(app_module):
+    client = app_module.app.test_client()
+    response = client.post('/generate?difficulty=easy', headers={'Accept': 'text/plain'})
+    board = decode_string(response.get_data(as_text=True).splitlines()[0])
+    puzzle_id = response.headers['X-Puzzle-Id']
+    # 提示请求带上编号即可使用预先记录的解题路径
+    assert app_module.solve_paths.match(puzzle_id, board) is not None
+
+
+def test_puzzle_cache_hit_restores_solve_path(app_module):
+    client = app_module.app.test_client()
+    puzzle_id = daily_puzzle_id(datetime.date(2025, 1, 1), 'easy')
+    data = client.get(f'/puzzle/{puzzle_id}').json
+    app_module.solve_paths._paths.clear()
+    response = client.get(f'/puzzle/{puzzle_id}', headers={'Accept': 'text/plain'})
+    assert response.headers['X-Puzzle-Id'] == puzzle_id
+    assert puzzle_id in app_module.solve_paths
+    assert app_module.solve_paths.match(puzzle_id, data['board']) is not None
+
+
+def test_solve_path_matches_fresh_logical_hints():
+    import random
+    from solve_path import record_solve_path
+    from sudoku_generator import generate_sudoku
+    from techniques import logical_hint
+
+    board, solution = generate_sudoku('hard', mode='incremental', rng=random.Random(5))
+    board = [line[:] for line in board]
+    # 复用同一个 Board 记录的路径与每一步重新分析的结果一致
+    for row, col, analysis in record_solve_path(board, solution):
+        deduction = logical_hint(board)
+        if analysis is None:
+            assert deduction is None
+        else:
+            assert (deduction['row'], deduction['col'], deduction['number']) == (row, col, analysis[0][2][0])
+        board[row][col] = solution[row][col]
@@ -0,0 +1,50 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for the LRU result cache.
+"""
+
+import result_cache
+from result_cache import LRUCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entry_expires_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_cache.time, 'monotonic', clock)
+    cache = LRUCache(maxsize=4, ttl=10)
+    cache.put('a', 1)
+    clock.now += 9
+    assert cache.get('a') == 1
+    assert 'a' in cache
+    clock.now += 2
+    assert 'a' not in cache
+    assert cache.get('a') is None
+    assert cache.stats() == {'size': 0, 'maxsize': 4, 'ttl': 10, 'hits': 1, 'misses': 1,
+                             'evictions': 0, 'expirations': 1}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    stats = cache.stats()
+    assert (stats['size'], stats['evictions'], stats['hits'], stats['misses']) == (2, 1, 3, 1)
+
+
+def test_zero_size_disables_cache():
+    cache = LRUCache(maxsize=0)
+    cache.put('a', 1)
+    assert cache.get('a') is None and len(cache) == 0
@@ -0,0 +1,43 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for the node and time budgets of solver searches.
+"""
+
+import pytest
+
+from search_budget import SearchBudget, BudgetExceeded
+from sudoku_solver import BACKENDS, has_unique_solution, analyze_hint, UNDETERMINED
+
+EMPTY = [[0] * 9 for _ in range(9)]
+NEARLY_EMPTY = [[1, 2, 3, 0, 0, 0, 0, 0, 0]] + [[0] * 9 for _ in range(8)]
+
+
+@pytest.mark.parametrize('backend', tuple(BACKENDS))
+def test_nearly_empty_board_exhausts_node_budget(backend):
+    budget = SearchBudget(max_nodes=20)
+    with pytest.raises(BudgetExceeded) as info:
+        has_unique_solution(NEARLY_EMPTY, backend=backend, use_cache=False, budget=budget)
+    assert info.value.reason == 'nodes'
+    assert budget.nodes == 21
+
+
+def test_time_budget():
+    with pytest.raises(BudgetExceeded) as info:
+        has_unique_solution(EMPTY, backend='backtrack', use_cache=False, budget=SearchBudget(max_seconds=0))
+    assert info.value.reason == 'time'
+
+
+def test_renew_starts_an_unused_budget():
+    budget = SearchBudget(max_nodes=20)
+    with pytest.raises(BudgetExceeded):
+        has_unique_solution(NEARLY_EMPTY, use_cache=False, budget=budget)
+    renewed = budget.renew()
+    assert (renewed.max_nodes, renewed.nodes) == (20, 0)
+
+
+def test_exhausted_budget_is_undetermined_not_cached():
+    assert analyze_hint(NEARLY_EMPTY, SearchBudget(max_nodes=20)) == UNDETERMINED
+    # 预算不足的结果不缓存，预算足够时可以得出结论
+    assert analyze_hint(NEARLY_EMPTY, SearchBudget(max_nodes=10 ** 6)) == "这个数独没有唯一解！"
@@ -0,0 +1,16 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for the seed bank used by the 'transform' generator mode.
+"""
+
+from seed_bank import load_seed_bank
+from sudoku_generator import DIFFICULTY_RANGES
+
+
+def test_seeds_cover_every_clue_count():
+    bank = load_seed_bank()
+    for difficulty, (min_numbers, max_numbers) in DIFFICULTY_RANGES.items():
+        clues = {sum(1 for line in board for num in line if num) for board, _ in bank[difficulty]}
+        assert clues == set(range(min_numbers, max_numbers + 1))
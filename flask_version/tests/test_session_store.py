@@ -0,0 +1,239 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for the session store and its SQLite write-behind backend.
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from functions import CompactBoard
+from session_db import SQLiteSessionBackend, board_delta, board_state, unpack_board
+from session_store import SessionStore, board_size
+
+BOARD = [[(row * 3 + row // 3 + col) % 9 + 1 if (row + col) % 3 else 0 for col in range(9)] for row in range(9)]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'sessions.db')
+
+
+def board_with_draft(num):
+    board = CompactBoard(BOARD)
+    board.add_draft_number(0, 0, num)
+    return board
+
+
+def restore(state):
+    return unpack_board(CompactBoard(), *state[:3])
+
+
+def test_concurrent_edits_from_two_workers_merge(db_path):
+    first = SessionStore(backend=SQLiteSessionBackend(db_path))
+    second = SessionStore(backend=SQLiteSessionBackend(db_path))
+    first.reset('sid', BOARD)
+    first.backend.flush()
+    with second.edit('sid') as board:
+        assert board.get_draft_numbers(0, 0) == []
+
+    # 同一个玩家的两个请求在同一个写入间隔内由不同的 worker 处理
+    with first.edit('sid') as board:
+        board.add_draft_number(0, 0, 1)
+    with second.edit('sid') as board:
+        board.add_draft_number(0, 0, 2)
+    first.backend.flush()
+    second.backend.flush()
+    first.backend.poll()
+    second.backend.poll()
+
+    for store in (first, second):
+        with store.edit('sid') as board:
+            assert board.get_draft_numbers(0, 0) == [1, 2]
+    assert first.reloaded == 1 and second.reloaded == 1
+
+
+def test_changes_apply_in_version_order(db_path):
+    first = SQLiteSessionBackend(db_path)
+    second = SQLiteSessionBackend(db_path)
+    board = CompactBoard(BOARD)
+    before = board_state(board)
+    board.add_draft_number(0, 0, 3)
+    first.save_delta('sid', board_delta(before, board), version=5)
+    second.save('sid', board_with_draft(1), version=10)
+    before = board_state(board)
+    board.add(1, 1, 1)
+    first.save_delta('sid', board_delta(before, board), version=15)
+    second.flush()
+    first.flush()  # 较晚写入的旧修改不能覆盖较新的重置
+    restored = restore(first.load('sid'))
+    assert restored.cells[0] == ord('1')
+    assert restored.get_draft_numbers(0, 0) == []
+    assert restored.cells[1:] == CompactBoard(BOARD).cells[1:]
+
+
+def test_unchanged_edit_is_not_saved(db_path):
+    store = SessionStore(backend=SQLiteSessionBackend(db_path))
+    store.reset('sid', BOARD)
+    with store.edit('sid') as board:
+        board.get_draft_numbers(0, 0)
+    assert store.backend.stats()['pending'] == 1
+
+
+def test_failed_flush_requeues_before_newer_changes(db_path):
+    backend = SQLiteSessionBackend(db_path)
+    backend.save('a', board_with_draft(1), version=1)
+    backend.save('b', board_with_draft(2), version=1)
+    broken = sqlite3.connect(db_path)
+    broken.close()
+    backend._local.conn = broken
+    assert backend.flush() == 0
+    assert backend.errors == 1
+    board = board_with_draft(1)
+    before = board_state(board)
+    board.add_draft_number(0, 0, 4)
+    backend.save_delta('a', board_delta(before, board), version=2)
+    backend._local.conn = None
+    assert backend.flush() == 3
+    assert restore(backend.load('a')).get_draft_numbers(0, 0) == [1, 4]
+    assert restore(backend.load('b')).get_draft_numbers(0, 0) == [2]
+
+
+def test_compaction_keeps_sessions_and_later_changes(db_path):
+    backend = SQLiteSessionBackend(db_path)
+    board = board_with_draft(1)
+    backend.save('sid', board, version=1)
+    before = board_state(board)
+    board.add_draft_number(0, 0, 2)
+    backend.save_delta('sid', board_delta(before, board), version=2)
+    backend.flush()
+    state = backend.load('sid')
+    assert backend.compact(age=0) == 1
+    assert backend.load('sid') == state
+    with backend._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM session_changes").fetchone()[0] == 0
+    before = board_state(board)
+    board.remove_draft_number(0, 0, 1)
+    backend.save_delta('sid', board_delta(before, board), version=3)
+    backend.flush()
+    assert restore(backend.load('sid')).get_draft_numbers(0, 0) == [2]
+
+
+def test_store_sees_other_workers_changes_after_poll(db_path):
+    first = SessionStore(backend=SQLiteSessionBackend(db_path))
+    second_backend = SQLiteSessionBackend(db_path)
+    second = SessionStore(backend=second_backend)
+    with second.edit('sid') as board:
+        assert board.get_draft_numbers(0, 0) == []
+    second_backend.flush()
+    second_backend.poll()
+
+    with first.edit('sid') as board:
+        board.add_draft_number(0, 0, 7)
+    first.backend.flush()
+
+    # 轮询之前只用内存中的副本，不查询数据库
+    seq = second._sessions['sid'][2]
+    assert not second_backend.has_newer('sid', seq)
+    assert second_backend.poll() >= 1
+    assert second_backend.has_newer('sid', seq)
+    loads = second_backend.loads
+    with second.edit('sid') as board:
+        assert board.get_draft_numbers(0, 0) == [7]
+    assert second.reloaded == 1
+    assert second_backend.loads == loads + 1
+
+
+def test_poll_skips_query_without_other_writers(db_path):
+    backend = SQLiteSessionBackend(db_path)
+    backend.poll()
+    polls = backend.polls
+    backend.save('sid', board_with_draft(1), version=1)
+    backend.flush()  # 自己的写入不改变本连接的 data_version
+    assert backend.poll() == 0
+    assert backend.polls == polls
+
+
+def test_purge_deletes_idle_sessions(db_path):
+    backend = SQLiteSessionBackend(db_path, ttl=60)
+    backend.save('old', board_with_draft(1), version=1)
+    backend.save('new', board_with_draft(2), version=1)
+    backend.flush()
+    with backend._connect() as conn:
+        conn.execute("UPDATE session_changes SET updated = ? WHERE sid = 'old'", (time.time() - 120,))
+    backend.purge()
+    assert backend.load('old') is None
+    assert backend.load('new') is not None
+    backend.compact(age=0)
+    with backend._connect() as conn:
+        conn.execute("UPDATE session_snapshots SET updated = ? WHERE sid = 'new'", (time.time() - 120,))
+    backend.purge()
+    assert backend.load('new') is None
+
+
+def test_slow_backend_read_does_not_block_other_sessions(db_path):
+    backend = SQLiteSessionBackend(db_path)
+    store = SessionStore(backend=backend)
+    with store.edit('fast'):
+        pass
+    started = threading.Event()
+    release = threading.Event()
+    load = backend.load
+
+    def slow_load(sid):
+        if sid == 'slow':
+            started.set()
+            release.wait(5)
+        return load(sid)
+
+    def edit_slow():
+        with store.edit('slow') as board:
+            board.add_draft_number(1, 1, 2)
+
+    backend.load = slow_load
+    thread = threading.Thread(target=edit_slow)
+    thread.start()
+    assert started.wait(5)
+    begin = time.monotonic()
+    with store.edit('fast') as board:
+        board.add_draft_number(1, 1, 1)
+    assert time.monotonic() - begin < 1
+    release.set()
+    thread.join(5)
+    assert not thread.is_alive()
+    # 会话锁已释放，之后的请求不会等待
+    assert store._session_lock('slow').acquire(timeout=1)
+    store._session_lock('slow').release()
+
+
+def test_lru_eviction_and_restore(db_path):
+    backend = SQLiteSessionBackend(db_path)
+    store = SessionStore(max_sessions=2, backend=backend)
+    for sid in ('a', 'b', 'c'):
+        with store.edit(sid) as board:
+            board.add_draft_number(0, 0, 1)
+    assert len(store) == 2 and store.evictions == 1
+    with store.edit('a') as board:
+        assert board.get_draft_numbers(0, 0) == [1]
+    assert store.restored == 1
+
+
+def test_byte_budget_evicts_least_recently_used():
+    size = board_size(CompactBoard(BOARD))
+    store = SessionStore(max_bytes=size * 2 + size // 10)
+    for sid in ('a', 'b'):
+        store.reset(sid, BOARD)
+    assert len(store) == 2 and store.evictions == 0
+    # 草稿越多棋盘越大，超出字节数上限时淘汰最久未使用的会话
+    with store.edit('b') as board:
+        for row in range(9):
+            for col in range(9):
+                board.add_draft_number(row, col, 9)
+    assert list(store._sessions) == ['b'] and store.evictions == 1
+    assert store.stats()['memory_bytes'] == board_size(board)
+    store.discard('b')
+    assert store.stats()['memory_bytes'] == 0
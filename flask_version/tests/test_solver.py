@@ -0,0 +1,64 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for the solver backends.
+"""
+
+import os
+
+import pytest
+
+from functions import string_to_board
+from sudoku_solver import BACKENDS, count_solutions, find_solutions, solve_sudoku
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+
+
+def load_corpus(name):
+    with open(os.path.join(BENCH_DIR, name + '.txt')) as f:
+        return [string_to_board(line.strip()) for line in f if line.strip()]
+
+
+def conflicting_board():
+    board = string_to_board(open(os.path.join(BENCH_DIR, 'easy.txt')).readline().strip())
+    row = board[0]
+    filled = [col for col in range(9) if row[col]]
+    empty = [col for col in range(9) if not row[col]]
+    row[empty[0]] = row[filled[0]]  # 同一行出现两个相同的数字
+    return board
+
+
+# 逐格回溯在 hard 语料上太慢，只比较较简单的语料
+@pytest.mark.parametrize('name, backends', [
+    ('easy', tuple(BACKENDS)),
+    ('medium', tuple(BACKENDS)),
+    ('hard', ('mrv', 'dlx')),
+    ('hard17', ('mrv', 'dlx')),
+])
+def test_backends_agree_on_corpora(name, backends):
+    for board in load_corpus(name):
+        solutions = {backend: find_solutions(board, limit=2, backend=backend) for backend in backends}
+        assert all(len(found) == 1 for found in solutions.values())
+        assert len({str(found) for found in solutions.values()}) == 1
+
+
+@pytest.mark.parametrize('backend', tuple(BACKENDS))
+def test_conflicting_givens_have_no_solution(backend):
+    board = conflicting_board()
+    assert count_solutions(board, backend=backend, use_cache=False) == 0
+    assert not solve_sudoku([line[:] for line in board], backend=backend)
+
+
+def test_mrv_counts_ambiguous_boards_like_backtrack():
+    for board in load_corpus('easy'):
+        # 去掉第一行的已知数字，通常得到多解的棋盘
+        board = [[0] * 9] + board[1:]
+        for limit in (1, 2, 5):
+            counts = [count_solutions(board, limit=limit, backend=backend, use_cache=False)
+                      for backend in ('mrv', 'backtrack')]
+            assert counts[0] == counts[1] <= limit
+        for solution in find_solutions(board, limit=5, backend='mrv'):
+            assert all(sorted(line) == list(range(1, 10)) for line in solution)
+            assert all(num == 0 or num == solution[row][col]
+                       for row, line in enumerate(board) for col, num in enumerate(line))
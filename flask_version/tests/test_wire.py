@@ -0,0 +1,49 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Tests for the board wire formats.
+"""
+
+import random
+
+import pytest
+
+from wire import PACKED_SIZE, pack, unpack, encode_string, decode_string, decode_board
+
+
+def random_boards(count, seed=1):
+    rng = random.Random(seed)
+    boards = [[[0] * 9 for _ in range(9)], [[9] * 9 for _ in range(9)]]
+    boards += [[[rng.randint(0, 9) for _ in range(9)] for _ in range(9)] for _ in range(count)]
+    return boards
+
+
+def test_pack_round_trip():
+    for board in random_boards(500):
+        data = pack(board)
+        assert len(data) == PACKED_SIZE
+        assert unpack(data) == board
+
+
+def test_string_round_trip():
+    for board in random_boards(500):
+        text = encode_string(board)
+        assert len(text) == 81
+        assert decode_string(text) == board
+        assert decode_string(text.replace('0', '.')) == board
+        assert decode_board(text) == board
+        assert decode_board(board) == board
+
+
+@pytest.mark.parametrize('value', ['1' * 80, '1' * 82, 'x' * 81, '１' * 81, [[1] * 9] * 8, [[1] * 8] * 9, [[10] * 9] * 9])
+def test_invalid_boards(value):
+    with pytest.raises(ValueError):
+        decode_board(value)
+
+
+def test_invalid_packed_data():
+    with pytest.raises(ValueError):
+        unpack(b'\x00' * (PACKED_SIZE - 1))
+    with pytest.raises(ValueError):
+        unpack(b'\xff' * PACKED_SIZE)  # 超过 81 位十进制数
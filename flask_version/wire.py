@@ -0,0 +1,148 @@
+"""
+Sudoku Tips Giver
+Copyright (c) 2025 Sudoku Tips Giver
+
+Wire formats for exchanging boards with clients.
+
+Besides the nested JSON lists used by the web page, every endpoint that receives or returns
+boards understands two compact forms:
+
+    text/plain                     81 characters per board, '0' or '.' for empty cells, one
+                                   board per line.
+    application/x-sudoku-packed    The 81 digits read as one base-10 integer, stored big-endian
+                                   in PACKED_SIZE (34) bytes; several boards are concatenated.
+
+Requests choose the form of their body with Content-Type (JSON bodies may also give a board as
+an 81-character string); responses choose the form of the boards they return with Accept.
+Boards are decoded straight into the 9x9 lists used by Board without going through
+string_to_board.
+"""
+
+JSON_MIMETYPE = 'application/json'
+STRING_MIMETYPE = 'text/plain'
+PACKED_MIMETYPE = 'application/x-sudoku-packed'
+
+# 10^81 < 2^270，34 字节足够存放 81 位十进制数
+PACKED_SIZE = 34
+
+# 按优先顺序排列，Accept 中权重相同时取靠前的格式（JSON 保持为默认）
+_FORMATS = {JSON_MIMETYPE: 'json', STRING_MIMETYPE: 'string', PACKED_MIMETYPE: 'packed'}
+
+# '.' 和 '0' 都表示空格
+_DIGITS = bytes.maketrans(b'.', b'0')
+
+
+def _rows(digits):
+    # digits 为 81 个 ASCII 数字
+    if len(digits) != 81 or not digits.isdigit():
+        raise ValueError("A board must have exactly 81 digits.")
+    return [[c - 48 for c in digits[i:i + 9]] for i in range(0, 81, 9)]
+
+
+def decode_string(s):
+    """
+    Decode an 81-character board.
+    Args:
+        s (str or bytes): The board, '0' or '.' for empty cells.
+    Returns:
+        list of list of int: The 9x9 board.
+    Raises:
+        ValueError: If the string is not a board.
+    """
+    if isinstance(s, str):
+        if not s.isascii():
+            raise ValueError("A board must have exactly 81 digits.")
+        s = s.encode('ascii')
+    return _rows(s.translate(_DIGITS))
+
+
+def encode_string(board):
+    """
+    Encode a board as 81 digits.
+    """
+    return bytes(num + 48 for row in board for num in row).decode('ascii')
+
+
+def unpack(data):
+    """
+    Decode a packed board.
+    Args:
+        data (bytes): PACKED_SIZE bytes.
+    Returns:
+        list of list of int: The 9x9 board.
+    Raises:
+        ValueError: If the data is not a packed board.
+    """
+    if len(data) != PACKED_SIZE:
+        raise ValueError(f"A packed board must have {PACKED_SIZE} bytes.")
+    return _rows(b'%081d' % int.from_bytes(data, 'big'))
+
+
+def pack(board):
+    """
+    Encode a board in the packed binary form.
+    """
+    return int(encode_string(board)).to_bytes(PACKED_SIZE, 'big')
+
+
+def decode_board(value):
+    """
+    Decode a board from a JSON value: a 9x9 list of numbers or an 81-character string.
+    Raises:
+        ValueError: If the value is not a board.
+    """
+    if isinstance(value, str):
+        return decode_string(value)
+    if (not isinstance(value, list) or len(value) != 9
+            or any(not isinstance(row, list) or len(row) != 9 for row in value)):
+        raise ValueError("A board must be a 9x9 list.")
+    board = [[int(num) for num in row] for row in value]
+    if any(not 0 <= num <= 9 for row in board for num in row):
+        raise ValueError("Numbers must be between 0 and 9.")
+    return board
+
+
+def request_format(request):
+    """
+    Get the format of a request body from its Content-Type.
+    Returns:
+        str: 'json', 'string' or 'packed'.
+    """
+    return _FORMATS.get(request.mimetype, 'json')
+
+
+def response_format(request):
+    """
+    Choose the format of the boards in a response from the Accept header.
+    Returns:
+        str: 'json', 'string' or 'packed'.
+    """
+    best = request.accept_mimetypes.best_match(list(_FORMATS), default=JSON_MIMETYPE)
+    return _FORMATS[best]
+
+
+def read_boards(request):
+    """
+    Read the boards of a non-JSON request body.
+    Returns:
+        list: The decoded boards.
+    Raises:
+        ValueError: If the body is not a sequence of boards.
+    """
+    data = request.get_data()
+    if request_format(request) == 'packed':
+        if not data or len(data) % PACKED_SIZE:
+            raise ValueError(f"The body must be a multiple of {PACKED_SIZE} bytes.")
+        return [unpack(data[i:i + PACKED_SIZE]) for i in range(0, len(data), PACKED_SIZE)]
+    return [decode_string(line.strip()) for line in data.splitlines() if line.strip()]
+
+
+def encode_boards(boards, fmt):
+    """
+    Encode boards for a 'string' or 'packed' response body.
+    Returns:
+        tuple: (body, mimetype)
+    """
+    if fmt == 'packed':
+        return b''.join(pack(board) for board in boards), PACKED_MIMETYPE
+    return ''.join(encode_string(board) + '\n' for board in boards), STRING_MIMETYPE
@@ -11,17 +11,65 @@ to a 2D list, and check if the board is solved. Additionally, it includes a `Boa
 class to represent and manipulate a Sudoku board.
 Functions:
     is_valid(board, row, col, num): Checks if a number is valid in a given cell of the Sudoku board.
+    has_conflicts(board): Checks if a number appears twice in a row, column or box.
     find_constraint(board): Finds the most constrained empty cell in the Sudoku board.
     string_to_board(s): Converts a string representation of a Sudoku board to a 2D list.
     is_solved(board): Checks if the Sudoku board is solved.
+    batch_candidates(boards): Vectorized candidate masks, counts and most constrained cells
+        of an (N, 9, 9) array of boards (requires numpy).
+Tables:
+    UNITS: The 27 units (rows, columns and boxes) as lists of (row, col) cells.
+    PEERS: For every cell, the 20 cells that share a row, column or box with it.
+    POPCOUNT / MASK_DIGITS: Number of digits and sorted digits of every 9-bit candidate mask.
 Class:
     Board: A class representing a Sudoku board with methods to add, remove, and validate numbers, 
            check if the board is solved, find the most constrained cell, and convert between 
            string and 2D list representations.
+    CompactBoard: A __slots__ board with the same public methods that stores its cells in a
+           bytearray and its draft numbers and initial cells as packed bit masks.
 """
 
+import os
 import random
 
+try:
+    import numpy as np
+except ImportError:  # numpy 只在批量分析接口中使用
+    np = None
+
+# 候选数字位掩码：数字 n 对应第 n-1 位
+ALL_DIGITS = 0x1FF
+
+# 多个格子同样受约束时的选择方式：'random' 随机选择，'first' 选择行优先顺序的第一个
+DEFAULT_TIE_BREAK = os.environ.get('SUDOKU_TIE_BREAK', 'random')
+
+# 预计算的查找表
+POPCOUNT = tuple(bin(mask).count("1") for mask in range(512))
+MASK_DIGITS = tuple(tuple(n for n in range(1, 10) if mask & (1 << (n - 1))) for mask in range(512))
+BOX_INDEX = tuple(tuple((row // 3) * 3 + col // 3 for col in range(9)) for row in range(9))
+UNITS = (
+    [[(row, col) for col in range(9)] for row in range(9)]
+    + [[(row, col) for row in range(9)] for col in range(9)]
+    + [[(row, col) for row in range(9) for col in range(9) if BOX_INDEX[row][col] == box] for box in range(9)]
+)
+PEERS = tuple(
+    tuple(
+        sorted({cell for unit in UNITS if (row, col) in unit for cell in unit} - {(row, col)})
+        for col in range(9)
+    )
+    for row in range(9)
+)
+
+def digit_bit(num):
+    """
+    Returns the candidate mask bit of a digit.
+    Args:
+        num (int): A digit from 1-9.
+    Returns:
+        int: The mask with only the bit of num set.
+    """
+    return 1 << (num - 1)
+
 # check if the number is valid on the board
 def is_valid(board, row, col, num):
     """
@@ -52,38 +100,43 @@ def is_valid(board, row, col, num):
                 return False
     return True
 
+def has_conflicts(board):
+    """
+    Check if the filled cells of a board contradict each other.
+    Args:
+        board (list of list of int): The 9x9 Sudoku board.
+    Returns:
+        bool: True if a number appears twice in a row, column or box.
+    """
+    row_masks = [0] * 9
+    col_masks = [0] * 9
+    box_masks = [0] * 9
+    for row in range(9):
+        for col in range(9):
+            num = board[row][col]
+            if num:
+                bit = 1 << (num - 1)
+                box = BOX_INDEX[row][col]
+                if (row_masks[row] | col_masks[col] | box_masks[box]) & bit:
+                    return True
+                row_masks[row] |= bit
+                col_masks[col] |= bit
+                box_masks[box] |= bit
+    return False
+
 # find the most constrained cell
-def find_constraint(board):
+def find_constraint(board, tie_break=None):
     """
     Finds the cell with the minimum number of possible values (constraints) in a Sudoku board.
     Args:
         board (list of list of int): A 9x9 list representing the Sudoku board, where 0 indicates an empty cell.
+        tie_break (str, optional): 'random' or 'first' (see Board.find_constraint).
     Returns:
         tuple: A tuple (min_row, min_col, constraint) where min_row and min_col are the row and column indices of the cell 
                with the minimum number of possible values, and constraint is the number of possible values for that cell.
     """
 
-    min_constraint = 10
-    min_row = -1
-    min_col = -1
-    candidates = []
-    for i in range(9):
-        for j in range(9):
-            if board[i][j] == 0:
-                current_constraint = 0
-                for num in range(1, 10):
-                    if is_valid(board, i, j, num):
-                        current_constraint += 1
-                if current_constraint < min_constraint:
-                    min_constraint = current_constraint
-                    candidates = [(i, j)]
-                elif current_constraint == min_constraint:
-                    candidates.append((i, j))
-    
-    if candidates:
-        min_row, min_col = random.choice(candidates)
-    
-    return min_row, min_col, min_constraint
+    return Board(board).find_constraint(tie_break)
 
 # convert a string of numbers to a 2D list (board) (given '0' for empty cells)
 def string_to_board(s):
@@ -126,6 +179,45 @@ def board_to_string(board):
         s += "/"
     return s
 
+def batch_candidates(boards):
+    """
+    Computes the candidates of every cell of many boards at once with array operations.
+    Args:
+        boards (array-like of int): An (N, 9, 9) array of boards, where 0 indicates an empty cell.
+    Returns:
+        tuple: (masks, counts, best) where masks is an (N, 81) uint16 array of candidate masks
+               (0 for filled cells), counts is an (N, 81) uint8 array of candidate counts and best is
+               an (N,) array with the flat index (row * 9 + col) of the first empty cell with the fewest
+               candidates, or -1 if the board is full.
+    """
+    if np is None:
+        raise ImportError("batch_candidates requires numpy")
+
+    boards = np.asarray(boards)
+    if boards.ndim != 3 or boards.shape[1:] != (9, 9):
+        raise ValueError("Invalid board array shape. Must be (N, 9, 9).")
+    if boards.size and (boards.min() < 0 or boards.max() > 9):
+        raise ValueError("Invalid board values. Must be digits 0-9.")
+
+    n = boards.shape[0]
+    digit_bits = np.array([0] + [1 << (num - 1) for num in range(1, 10)], dtype=np.uint16)
+    bits = digit_bits[boards]
+
+    # 每行、每列、每宫已使用的数字
+    row_used = np.bitwise_or.reduce(bits, axis=2)
+    col_used = np.bitwise_or.reduce(bits, axis=1)
+    box_used = np.bitwise_or.reduce(bits.reshape(n, 3, 3, 3, 3), axis=(2, 4))
+    used = row_used[:, :, None] | col_used[:, None, :] | box_used.repeat(3, axis=1).repeat(3, axis=2)
+
+    empty = (boards == 0).reshape(n, 81)
+    masks = np.where(empty, ALL_DIGITS & ~used.reshape(n, 81), 0).astype(np.uint16)
+    counts = np.array(POPCOUNT, dtype=np.uint8)[masks]
+
+    # 已填的格子不参与比较；argmin 在并列时取第一个（行优先）
+    best = np.where(empty, counts, 10).argmin(axis=1)
+    best = np.where(empty.any(axis=1), best, -1)
+    return masks, counts, best
+
 # check if the board is solved
 def is_solved(board):
     """
@@ -148,6 +240,11 @@ class Board:
     A class representing a Sudoku board.
     Attributes:
         board (list of list of int): A 9x9 list representing the Sudoku board.
+        row_masks, col_masks, box_masks (list of int): Digit masks of every row, column and box,
+            kept up to date by place/clear so candidate lookup is a single OR/AND.
+        The most-constrained-cell index (empty cells grouped by candidate count) is built by the
+        first most_constrained_cells/find_constraint call and then kept up to date by place/clear,
+        so a Board that is filled in step by step (as record_solve_path does) builds it only once.
     """
 
     def __init__(self, board=None):
@@ -162,6 +259,27 @@ class Board:
             self.board = board
         self.initial_cells = set()  # 存储初始数字的位置
         self.draft_numbers = [[set() for _ in range(9)] for _ in range(9)]  # 存储草稿数字
+        self.rebuild_masks()
+
+    def rebuild_masks(self):
+        """
+        Recompute the row, column and box digit masks from self.board.
+        Must be called after self.board has been modified without going through place/clear.
+        """
+        # 候选数索引在下次查询时重建
+        self._counts = None
+        self._buckets = None
+        self.row_masks = [0] * 9
+        self.col_masks = [0] * 9
+        self.box_masks = [0] * 9
+        for row in range(9):
+            for col in range(9):
+                num = self.board[row][col]
+                if num:
+                    bit = 1 << (num - 1)
+                    self.row_masks[row] |= bit
+                    self.col_masks[col] |= bit
+                    self.box_masks[BOX_INDEX[row][col]] |= bit
 
     def __iter__(self):
         """
@@ -183,8 +301,8 @@ class Board:
         """
         row = int(row - 1)
         col = int(col - 1)
-        if is_valid(self.board, row, col, num):
-            self.board[row][col] = num
+        if self.is_valid(row, col, num):
+            self.place(row, col, num)
             # 清除该格子的所有草稿数字
             self.clear_draft_numbers(row, col)
             print("Number on row", row+1, "col", col+1, "added successfully!")
@@ -208,10 +326,87 @@ class Board:
         if self.board[row][col] == 0:
             print("Cell is already empty!")
             pass
-        self.board[row][col] = 0
+        self.clear(row, col)
         print("Number on row", row+1, "col", col+1, "removed successfully!")
         pass
 
+    def place(self, row, col, num):
+        """
+        Place a number without validation and update the digit masks (0-based indices, used by the solvers).
+        Args:
+            row (int): The row index (0-8).
+            col (int): The column index (0-8).
+            num (int): The number to be placed (1-9).
+        """
+        if self.board[row][col]:
+            self.clear(row, col)
+        bit = 1 << (num - 1)
+        self.board[row][col] = num
+        self.row_masks[row] |= bit
+        self.col_masks[col] |= bit
+        self.box_masks[BOX_INDEX[row][col]] |= bit
+        if self._counts is not None:
+            self._reindex(row, col)
+
+    def clear(self, row, col):
+        """
+        Empty a cell and update the digit masks (0-based indices, used by the solvers).
+        Args:
+            row (int): The row index (0-8).
+            col (int): The column index (0-8).
+        """
+        num = self.board[row][col]
+        if num:
+            bit = ~(1 << (num - 1))
+            self.board[row][col] = 0
+            self.row_masks[row] &= bit
+            self.col_masks[col] &= bit
+            self.box_masks[BOX_INDEX[row][col]] &= bit
+            if self._counts is not None:
+                self._reindex(row, col)
+
+    def candidates(self, row, col):
+        """
+        Get the candidate mask of a cell: bit n-1 is set if digit n is not used by any of its peers.
+        Args:
+            row (int): The row index (0-8).
+            col (int): The column index (0-8).
+        Returns:
+            int: A 9-bit candidate mask.
+        """
+        return ALL_DIGITS & ~(self.row_masks[row] | self.col_masks[col] | self.box_masks[BOX_INDEX[row][col]])
+
+    def candidate_list(self, row, col):
+        """
+        Get the possible numbers of a cell in ascending order.
+        Args:
+            row (int): The row index (0-8).
+            col (int): The column index (0-8).
+        Returns:
+            tuple: The digits that can be placed in the cell.
+        """
+        return MASK_DIGITS[self.candidates(row, col)]
+
+    def find_empty(self):
+        """
+        Find the first empty cell in row-major order.
+        Returns:
+            tuple: (row, col) or None if the board is full.
+        """
+        for row in range(9):
+            line = self.board[row]
+            for col in range(9):
+                if line[col] == 0:
+                    return (row, col)
+        return None
+
+    def empty_cells(self):
+        """
+        List the empty cells in row-major order.
+        Returns:
+            list: (row, col) tuples of all empty cells.
+        """
+        return [(row, col) for row in range(9) for col in range(9) if self.board[row][col] == 0]
 
     def is_valid(self, row, col, num):
         """
@@ -223,7 +418,7 @@ class Board:
         Returns:
             bool: True if the number can be placed in the given position, False otherwise.
         """
-        return is_valid(self.board, row, col, num)
+        return not (self.row_masks[row] | self.col_masks[col] | self.box_masks[BOX_INDEX[row][col]]) & (1 << (num - 1))
 
     def is_solved(self):
         """
@@ -233,14 +428,87 @@ class Board:
         """
         return is_solved(self.board)
 
-    def find_constraint(self):
+    def find_constraint(self, tie_break=None):
         """
         Finds the cell with the minimum number of possible values (constraints) in the Sudoku board.
+        Args:
+            tie_break (str, optional): How to choose between equally constrained cells: 'random', or 'first'
+                for the first one in row-major order. Defaults to DEFAULT_TIE_BREAK.
         Returns:
             tuple: A tuple (min_row, min_col, constraint) where min_row and min_col are the row and column indices of the cell 
                    with the minimum number of possible values, and constraint is the number of possible values for that cell.
         """
-        return find_constraint(self.board)
+        tie_break = tie_break or DEFAULT_TIE_BREAK
+        min_row = -1
+        min_col = -1
+        if tie_break == 'first':
+            self._build_index()
+            for min_constraint, bucket in enumerate(self._buckets):
+                if bucket:
+                    # 最低位就是行优先顺序的第一个格子
+                    min_row, min_col = divmod((bucket & -bucket).bit_length() - 1, 9)
+                    return min_row, min_col, min_constraint
+            return min_row, min_col, 10
+
+        min_constraint, candidates = self.most_constrained_cells()
+        if candidates:
+            min_row, min_col = random.choice(candidates)
+
+        return min_row, min_col, min_constraint
+
+    def most_constrained_cells(self):
+        """
+        Finds all empty cells that share the minimum number of possible values.
+        Returns:
+            tuple: (constraint, cells) where cells is the list of (row, col) tuples in row-major order
+                   and constraint is their number of possible values (10 and [] if the board is full).
+        """
+        self._build_index()
+        for min_constraint, bucket in enumerate(self._buckets):
+            if bucket:
+                cells = []
+                while bucket:
+                    low = bucket & -bucket
+                    cells.append(divmod(low.bit_length() - 1, 9))
+                    bucket ^= low
+                return min_constraint, cells
+        return 10, []
+
+    def _build_index(self):
+        """
+        Build the most-constrained-cell index if it does not exist yet:
+        _counts[i] is the candidate count of cell i (-1 if filled) and _buckets[k] an 81-bit mask of
+        the empty cells with k candidates (bit i is cell i in row-major order).
+        """
+        if self._counts is not None:
+            return
+        counts = [-1] * 81
+        buckets = [0] * 10
+        for row in range(9):
+            for col in range(9):
+                if self.board[row][col] == 0:
+                    index = row * 9 + col
+                    count = POPCOUNT[self.candidates(row, col)]
+                    counts[index] = count
+                    buckets[count] |= 1 << index
+        self._counts = counts
+        self._buckets = buckets
+
+    def _reindex(self, row, col):
+        # 重新计算该格及其同行、同列、同宫格子的候选数数量
+        counts = self._counts
+        buckets = self._buckets
+        board = self.board
+        for peer_row, peer_col in [(row, col)] + PEERS[row][col]:
+            index = peer_row * 9 + peer_col
+            count = -1 if board[peer_row][peer_col] else POPCOUNT[self.candidates(peer_row, peer_col)]
+            old = counts[index]
+            if count != old:
+                if old >= 0:
+                    buckets[old] &= ~(1 << index)
+                if count >= 0:
+                    buckets[count] |= 1 << index
+                counts[index] = count
 
     def string_to_board(self, s):
         """
@@ -249,6 +517,7 @@ class Board:
             s (str): A string of length 81 representing the Sudoku board, where each character is a digit from 0-9.
         """
         self.board = string_to_board(s)
+        self.rebuild_masks()
         return self.board
     
     def board_to_string(self):
@@ -317,3 +586,336 @@ class Board:
         """
         return f"{row},{col}" in self.initial_cells
 
+
+
+class CompactBoard:
+    """
+    A memory-compact Sudoku board with the same public methods as Board.
+    Attributes:
+        cells (bytearray): 81 ASCII digits in row-major order ('0' for empty); this buffer is also
+            the 81-character string form of the board.
+        drafts (int): 81 packed 9-bit draft masks, cell i uses bits 9*i .. 9*i+8.
+        initial_mask (int): Bit i is set if cell i holds an initial number.
+    """
+
+    __slots__ = ('cells', 'drafts', 'initial_mask')
+
+    def __init__(self, board=None):
+        """
+        Initialize the CompactBoard class.
+        Args:
+            board (list of list of int, optional): A 9x9 list representing the Sudoku board. Defaults to None.
+        """
+        self.cells = bytearray(b"0" * 81)
+        self.drafts = 0
+        self.initial_mask = 0
+        if board is not None:
+            for row in range(9):
+                for col in range(9):
+                    self.cells[row * 9 + col] = 48 + board[row][col]
+
+    @classmethod
+    def from_bytes(cls, buffer):
+        """
+        Create a board that uses buffer as its cells without copying it.
+        Args:
+            buffer (bytearray): 81 ASCII digits.
+        Returns:
+            CompactBoard: The new board.
+        """
+        if not isinstance(buffer, bytearray) or len(buffer) != 81 or not buffer.isdigit():
+            raise ValueError("Invalid input. Must be a bytearray of 81 digits.")
+        board = cls.__new__(cls)
+        board.cells = buffer
+        board.drafts = 0
+        board.initial_mask = 0
+        return board
+
+    @classmethod
+    def from_string(cls, s):
+        """
+        Create a board from a string representation ('\\n', '/' and ' ' are ignored).
+        Args:
+            s (str): A string of 81 digits.
+        Returns:
+            CompactBoard: The new board.
+        """
+        s = s.replace("\n", "").replace("/", "").replace(" ", "")
+        if len(s) != 81 or not s.isdigit():
+            raise ValueError("Invalid input length. Must be 81 digits.")
+        return cls.from_bytes(bytearray(s, "ascii"))
+
+    def to_bytes(self):
+        """
+        Get a read-only view of the 81 ASCII digits without copying them.
+        Returns:
+            memoryview: The cells buffer.
+        """
+        return memoryview(self.cells).toreadonly()
+
+    def to_string(self):
+        """
+        Get the 81-character string form of the board.
+        Returns:
+            str: 81 digits in row-major order.
+        """
+        return self.cells.decode("ascii")
+
+    @property
+    def board(self):
+        """
+        A new 9x9 list of the board's numbers.
+        """
+        return [[self.cells[row * 9 + col] - 48 for col in range(9)] for row in range(9)]
+
+    def __iter__(self):
+        """
+        Make the CompactBoard class iterable by rows.
+        Returns:
+            iterator: An iterator over the rows of the board.
+        """
+        return iter(self.board)
+
+    def get(self, row, col):
+        """
+        Get the number in a cell (0 for empty).
+        Args:
+            row (int): 行索引 (0-8)
+            col (int): 列索引 (0-8)
+        Returns:
+            int: The number in the cell.
+        """
+        return self.cells[row * 9 + col] - 48
+
+    def add(self, row, col, num):
+        """
+        Add a number to the board at the specified position.
+        Args:
+            row (int): The row index where the number is to be placed.
+            col (int): The column index where the number is to be placed.
+            num (int): The number to be placed in the given position.
+        """
+        row = int(row - 1)
+        col = int(col - 1)
+        if self.is_valid(row, col, num):
+            self.place(row, col, num)
+            # 清除该格子的所有草稿数字
+            self.clear_draft_numbers(row, col)
+            print("Number on row", row+1, "col", col+1, "added successfully!")
+        elif self.get(row, col) != 0:
+            print("Number already exists in the cell!")
+        else:
+            print("Invalid number! Try again.")
+
+    def remove(self, row, col):
+        """
+        Remove a number from the board at the specified position.
+        Args:
+            row (int): The row index where the number is to be removed.
+            col (int): The column index where the number is to be removed.
+        """
+        row = int(row - 1)
+        col = int(col - 1)
+        if self.get(row, col) == 0:
+            print("Cell is already empty!")
+        self.clear(row, col)
+        print("Number on row", row+1, "col", col+1, "removed successfully!")
+
+    def place(self, row, col, num):
+        """
+        Place a number without validation (0-based indices).
+        """
+        self.cells[row * 9 + col] = 48 + num
+
+    def clear(self, row, col):
+        """
+        Empty a cell (0-based indices).
+        """
+        self.cells[row * 9 + col] = 48
+
+    def candidates(self, row, col):
+        """
+        Get the candidate mask of a cell: bit n-1 is set if digit n is not used by any of its peers.
+        Args:
+            row (int): The row index (0-8).
+            col (int): The column index (0-8).
+        Returns:
+            int: A 9-bit candidate mask.
+        """
+        cells = self.cells
+        used = 0
+        for peer_row, peer_col in PEERS[row][col]:
+            num = cells[peer_row * 9 + peer_col] - 48
+            if num:
+                used |= 1 << (num - 1)
+        num = cells[row * 9 + col] - 48
+        if num:
+            used |= 1 << (num - 1)
+        return ALL_DIGITS & ~used
+
+    def candidate_list(self, row, col):
+        """
+        Get the possible numbers of a cell in ascending order.
+        Returns:
+            tuple: The digits that can be placed in the cell.
+        """
+        return MASK_DIGITS[self.candidates(row, col)]
+
+    def is_valid(self, row, col, num):
+        """
+        Check if a number can be placed in a given position on the Sudoku board without violating Sudoku rules.
+        Returns:
+            bool: True if the number can be placed in the given position, False otherwise.
+        """
+        return bool(self.candidates(row, col) & (1 << (num - 1)))
+
+    def find_empty(self):
+        """
+        Find the first empty cell in row-major order.
+        Returns:
+            tuple: (row, col) or None if the board is full.
+        """
+        index = self.cells.find(b"0")
+        return None if index < 0 else divmod(index, 9)
+
+    def empty_cells(self):
+        """
+        List the empty cells in row-major order.
+        Returns:
+            list: (row, col) tuples of all empty cells.
+        """
+        return [divmod(index, 9) for index in range(81) if self.cells[index] == 48]
+
+    def is_solved(self):
+        """
+        Check if the Sudoku board is solved.
+        Returns:
+            bool: True if the board is solved, False otherwise.
+        """
+        return b"0" not in self.cells
+
+    def find_constraint(self, tie_break=None):
+        """
+        Finds the cell with the minimum number of possible values (constraints) in the Sudoku board.
+        Returns:
+            tuple: (min_row, min_col, constraint)
+        """
+        return Board(self.board).find_constraint(tie_break)
+
+    def most_constrained_cells(self):
+        """
+        Finds all empty cells that share the minimum number of possible values.
+        Returns:
+            tuple: (constraint, cells)
+        """
+        return Board(self.board).most_constrained_cells()
+
+    def string_to_board(self, s):
+        """
+        Load the board from a string representation of 81 digits and return it as a 2D list.
+        """
+        self.cells = CompactBoard.from_string(s).cells
+        return self.board
+
+    def board_to_string(self):
+        """
+        Converts the board into the same string form as board_to_string.
+        Returns:
+            str: 9 groups of 9 digits, each followed by '/'.
+        """
+        s = self.to_string()
+        return "".join(s[i:i + 9] + "/" for i in range(0, 81, 9))
+
+    @staticmethod
+    def _draft_offset(row, col):
+        # 该格 9 位草稿掩码的起始位；与 Board 的列表下标一样，越界时抛出 IndexError
+        if not (0 <= row < 9 and 0 <= col < 9):
+            raise IndexError("draft position out of range")
+        return (row * 9 + col) * 9
+
+    @classmethod
+    def _draft_bit(cls, row, col, num):
+        if not 1 <= num <= 9:
+            raise IndexError("draft number out of range")
+        return 1 << (cls._draft_offset(row, col) + num - 1)
+
+    def add_draft_number(self, row, col, num):
+        """
+        在指定位置添加草稿数字
+        Args:
+            row (int): 行索引 (0-8)
+            col (int): 列索引 (0-8)
+            num (int): 要添加的数字 (1-9)
+        """
+        bit = self._draft_bit(row, col, num)
+        if not self.is_initial_cell(row, col) and self.get(row, col) == 0:
+            self.drafts |= bit
+
+    def remove_draft_number(self, row, col, num):
+        """
+        从指定位置移除草稿数字
+        Args:
+            row (int): 行索引 (0-8)
+            col (int): 列索引 (0-8)
+            num (int): 要移除的数字 (1-9)
+        """
+        self.drafts &= ~self._draft_bit(row, col, num)
+
+    def get_draft_mask(self, row, col):
+        """
+        获取指定位置的草稿数字位掩码
+        Returns:
+            int: 9 位掩码，第 n-1 位表示数字 n
+        """
+        return (self.drafts >> self._draft_offset(row, col)) & ALL_DIGITS
+
+    def get_draft_numbers(self, row, col):
+        """
+        获取指定位置的草稿数字
+        Args:
+            row (int): 行索引 (0-8)
+            col (int): 列索引 (0-8)
+        Returns:
+            list: 该位置的草稿数字列表
+        """
+        return list(MASK_DIGITS[self.get_draft_mask(row, col)])
+
+    def clear_draft_numbers(self, row, col):
+        """
+        清除指定位置的所有草稿数字
+        Args:
+            row (int): 行索引 (0-8)
+            col (int): 列索引 (0-8)
+        """
+        self.drafts &= ~(ALL_DIGITS << self._draft_offset(row, col))
+
+    def clear_all_draft_numbers(self):
+        """
+        清除所有格子的草稿数字
+        """
+        self.drafts = 0
+
+    def set_initial_cell(self, row, col, initial=True):
+        """
+        标记或取消标记指定位置为初始数字
+        Args:
+            row (int): 行索引 (0-8)
+            col (int): 列索引 (0-8)
+            initial (bool): 是否为初始数字
+        """
+        bit = 1 << (row * 9 + col)
+        if initial:
+            self.initial_mask |= bit
+        else:
+            self.initial_mask &= ~bit
+
+    def is_initial_cell(self, row, col):
+        """
+        检查指定位置是否为初始数字
+        Args:
+            row (int): 行索引 (0-8)
+            col (int): 列索引 (0-8)
+        Returns:
+            bool: 如果是初始数字返回 True，否则返回 False
+        """
+        return bool(self.initial_mask >> (row * 9 + col) & 1)